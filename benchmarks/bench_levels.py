@@ -0,0 +1,37 @@
+"""
+Микро-бенчмарк get_level: таблица + bisect против старого цикла по уровням.
+Запуск из корня репозитория: python -m benchmarks.bench_levels
+"""
+import random
+import timeit
+from levels import get_level, xp_for_level
+
+
+def get_level_loop(total_xp: int):
+    lvl = 1
+    xp  = total_xp
+    while xp >= xp_for_level(lvl):
+        xp -= xp_for_level(lvl)
+        lvl += 1
+    return lvl, xp
+
+
+def main():
+    for total in list(range(0, 20_000)) + [10 ** k for k in range(3, 10)]:
+        assert get_level(total) == get_level_loop(total), total
+
+    print(f"{'XP':>14} {'уровень':>8} {'цикл, мкс':>11} {'bisect, мкс':>12} {'x':>7}")
+    for total in (1_000, 100_000, 1_000_000, 10_000_000, 100_000_000):
+        n     = 2_000
+        loop  = timeit.timeit(lambda: get_level_loop(total), number=n) / n * 1e6
+        fast  = timeit.timeit(lambda: get_level(total), number=n) / n * 1e6
+        print(f"{total:>14,} {get_level(total)[0]:>8} {loop:>11.2f} {fast:>12.3f} {loop / fast:>7.0f}")
+
+    sample = [random.randint(0, 5_000_000) for _ in range(10_000)]
+    loop   = timeit.timeit(lambda: [get_level_loop(x) for x in sample], number=1)
+    fast   = timeit.timeit(lambda: [get_level(x) for x in sample], number=1)
+    print(f"\n10 000 случайных XP до 5M: цикл {loop * 1e3:.1f} мс, bisect {fast * 1e3:.1f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Генерация заказов склада: старый generate_order против Catalogue.
+Запуск из корня репозитория: python -m benchmarks.bench_orders
+"""
+import random
+import timeit
+from collections import Counter
+from catalogue import Catalogue, np
+from data import SPORT_ITEMS_WITH_BRANDS
+
+
+def generate_order_loop():
+    n = random.randint(1, 30)
+    positions = []
+    for _ in range(n):
+        brand    = random.choice(list(SPORT_ITEMS_WITH_BRANDS.keys()))
+        item     = random.choice(SPORT_ITEMS_WITH_BRANDS[brand])
+        location = f"3{random.choice('BC')}{random.randint(1,56)}{random.choice('ABCDEFGHJ')}{random.randint(1,4)}"
+        positions.append({"location": location, "item": f"{brand} - {item}", "status": "не выполнено"})
+    return positions
+
+
+def main():
+    cat = Catalogue(SPORT_ITEMS_WITH_BRANDS, seed=1)
+    print(f"NumPy: {'да' if np is not None else 'нет'} | товаров: {len(cat.items)} | ячеек: {len(cat.locations)}")
+
+    # распределение товаров должно совпадать со старым (бренд, затем товар)
+    old = Counter(p["item"] for _ in range(20_000) for p in generate_order_loop())
+    new = Counter(item for order in cat.orders(20_000) for _, item in order)
+    worst = max(abs(old[k] / sum(old.values()) - new[k] / sum(new.values())) for k in cat.items)
+    print(f"Макс. расхождение долей товаров: {worst:.4f}\n")
+
+    n = 20_000
+    loop   = timeit.timeit(generate_order_loop, number=n) / n * 1e6
+    single = timeit.timeit(cat.order, number=n) / n * 1e6
+    batch  = timeit.timeit(lambda: cat.orders(n), number=1) / n * 1e6
+    print(f"{'способ':<28} {'мкс/заказ':>10}")
+    print(f"{'старый generate_order':<28} {loop:>10.2f}")
+    print(f"{'Catalogue.order (буфер)':<28} {single:>10.2f}")
+    print(f"{'Catalogue.orders (пачка)':<28} {batch:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
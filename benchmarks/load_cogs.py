@@ -0,0 +1,409 @@
+"""
+Нагрузочный прогон cog-ов без подключения к Discord.
+Поддельные ctx / Interaction / Member / Guild / Channel вызывают обработчики
+EconomyCog, GamesCog, ShopCog, WorkCog и XPCog напрямую (как это делает
+discord.ext.commands после разбора аргументов). Данные пишутся во временную
+папку, в конце выводятся команды/с, p50/p99 времени обработчика по каждой
+команде и сколько байт ушло на диск.
+
+Запуск из корня репозитория:
+    python -m benchmarks.load_cogs --users 200 --commands 20000 --rate 0
+    STORAGE_BACKEND=sqlite python -m benchmarks.load_cogs
+
+--rate N — целевая частота команд в секунду (0 — так быстро, как получится).
+Паузы пикинга (таймеры PICK_TIMERS и asyncio.sleep в cogs.work) по умолчанию
+срабатывают сразу: --real-sleep включает их обратно.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+import types
+from collections import defaultdict
+
+
+# ── Поддельные объекты Discord ────────────────────────────────
+class FakeAsset:
+    url = "https://cdn.discordapp.com/embed/avatars/0.png"
+
+
+class FakeMember:
+    bot = False
+
+    def __init__(self, uid: int, guild=None):
+        self.id             = uid
+        self.name           = f"user{uid}"
+        self.display_name   = f"Игрок {uid}"
+        self.mention        = f"<@{uid}>"
+        self.display_avatar = FakeAsset()
+        self.guild          = guild
+
+    def __eq__(self, other):
+        return getattr(other, "id", None) == self.id
+
+    def __hash__(self):
+        return self.id
+
+
+class FakeMessage:
+    _next_id = 1
+
+    def __init__(self, channel, author=None, content="", view=None):
+        FakeMessage._next_id += 1
+        self.id      = FakeMessage._next_id
+        self.channel = channel
+        self.guild   = channel.guild
+        self.author  = author
+        self.content = content
+        self.view    = view
+
+    async def delete(self, *, delay=None):
+        self.channel.api_calls += 1
+
+    async def edit(self, content=None, view=None, **kwargs):
+        self.channel.api_calls += 1
+        if view is not None:
+            self.view = view
+
+
+class FakeChannel:
+    def __init__(self, guild, cid: int = 1):
+        self.id        = cid
+        self.guild     = guild
+        self.api_calls = 0
+        self.last_view = None
+
+    async def send(self, content=None, *, view=None, **kwargs):
+        self.api_calls += 1
+        if view is not None:
+            self.last_view = view
+        return FakeMessage(self, content=content or "", view=view)
+
+
+class FakeGuild:
+    def __init__(self, n_users: int):
+        self.id       = 1
+        self.members  = {uid: FakeMember(uid, self) for uid in range(1, n_users + 1)}
+        self.channel  = FakeChannel(self)
+
+    def get_member(self, uid):
+        return self.members.get(uid)
+
+    async def fetch_member(self, uid):
+        return self.members[uid]
+
+    async def query_members(self, *, user_ids=(), limit=5, cache=True):
+        return [self.members[u] for u in user_ids if u in self.members]
+
+
+class FakeCtx:
+    def __init__(self, bot, guild, author):
+        self.bot     = bot
+        self.guild   = guild
+        self.author  = author
+        self.channel = guild.channel
+        self.message = FakeMessage(self.channel, author)
+
+    async def send(self, *args, **kwargs):
+        return await self.channel.send(*args, **kwargs)
+
+
+class FakeResponse:
+    def __init__(self, channel):
+        self._channel = channel
+
+    async def defer(self):
+        self._channel.api_calls += 1
+
+    async def send_message(self, *args, **kwargs):
+        self._channel.api_calls += 1
+
+
+class FakeInteraction:
+    def __init__(self, guild, user, message):
+        self.user     = user
+        self.guild    = guild
+        self.channel  = guild.channel
+        self.message  = message
+        self.response = FakeResponse(guild.channel)
+
+
+class FakeBot:
+    def __init__(self, loop):
+        self.loop   = loop
+        self._ready = asyncio.Event()   # никогда не наступает: фоновые задачи cog-ов в прогоне не нужны
+
+    def is_closed(self):
+        return False
+
+    async def wait_until_ready(self):
+        await self._ready.wait()
+
+    async def wait_for(self, event, *, check=None, timeout=None):
+        raise asyncio.TimeoutError   # блэкджек: игрок «думает» дольше таймаута → стенд
+
+    def get_user(self, uid):
+        return None
+
+
+# ── Учёт записи на диск ───────────────────────────────────────
+PERSIST = {"bytes": 0, "writes": 0}
+
+
+def _count_persistence():
+    import storage
+    import journal
+
+    write_json = storage._write_json
+
+    def counted_write_json(path, data):
+        write_json(path, data)
+        PERSIST["bytes"]  += os.path.getsize(path)
+        PERSIST["writes"] += 1
+    storage._write_json = counted_write_json
+
+    append = journal.Journal._append
+
+    def counted_append(self, batch):
+        before = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        append(self, batch)
+        PERSIST["bytes"]  += os.path.getsize(self.path) - before
+        PERSIST["writes"] += 1
+    journal.Journal._append = counted_append
+
+    try:
+        import sqlite_store
+    except ImportError:
+        return
+    write_rows = sqlite_store.SQLiteCollection._write_rows
+
+    def counted_write_rows(self, rows, dels):
+        write_rows(self, rows, dels)
+        PERSIST["bytes"]  += sum(len(k) + len(repr(v)) for k, v in rows) + sum(len(k) for k, in dels)
+        PERSIST["writes"] += 1
+    sqlite_store.SQLiteCollection._write_rows = counted_write_rows
+
+
+def _skip_sleeps(*modules):
+    """asyncio внутри модулей cog-ов, у которого sleep() не ждёт."""
+    async def sleep(delay, result=None):
+        await asyncio.sleep(0)
+        return result
+    fast = types.SimpleNamespace(**{k: getattr(asyncio, k) for k in dir(asyncio) if not k.startswith("__")})
+    fast.sleep = sleep
+    for module in modules:
+        module.asyncio = fast
+
+
+class _InstantTimers:
+    """Замена TimerWheel: таймер срабатывает на следующем проходе loop."""
+
+    def schedule(self, key, delay, on_expire, **kwargs):
+        asyncio.get_running_loop().create_task(on_expire())
+
+    def cancel(self, key):
+        pass
+
+
+# ── Сценарии ──────────────────────────────────────────────────
+class Driver:
+    def __init__(self, bot, guild, cogs):
+        self.bot    = bot
+        self.guild  = guild
+        self.eco, self.games, self.shop, self.work, self.xp = cogs
+        self.users  = list(guild.members.values())
+        self.views  = {}   # uid -> (view, message) активной работы
+
+    def _ctx(self, user):
+        return FakeCtx(self.bot, self.guild, user)
+
+    def _other(self, user):
+        other = random.choice(self.users)
+        return other if other.id != user.id else self.users[0]
+
+    async def run(self, name, user):
+        cog, cmd, args = getattr(self, f"_{name}")(user)
+        if cmd is None:
+            return await args
+        await cmd.callback(cog, self._ctx(user), *args)
+
+    # (cog, команда, аргументы) или (None, None, корутина) для view/слушателей
+    def _money(self, u):    return self.eco, self.eco.check_funds, ()
+    def _pay(self, u):      return self.eco, self.eco.pay, (self._other(u), random.randint(1, 500))
+    def _deposit(self, u):  return self.eco, self.eco.deposit, (random.randint(1, 300),)
+    def _withdraw(self, u): return self.eco, self.eco.withdraw, (random.randint(1, 300),)
+    def _top(self, u):      return self.eco, self.eco.leaderboard, (random.randint(1, 3),)
+    def _toplevel(self, u): return self.eco, self.eco.top_level, (random.randint(1, 3),)
+    def _daily(self, u):    return self.eco, self.eco.daily_bonus, ()
+    def _rob(self, u):      return self.eco, self.eco.rob, (self._other(u),)
+    def _crime(self, u):    return self.eco, self.eco.crime, ()
+    def _bj(self, u):       return self.games, self.games.blackjack, (random.randint(10, 200),)
+    def _flip(self, u):     return self.games, self.games.flip, (random.randint(10, 200), random.choice("ор"))
+    def _spin(self, u):     return self.games, self.games.spin, (random.randint(10, 200),)
+    def _dice(self, u):     return self.games, self.games.dice_game, (random.randint(10, 200), random.randint(1, 6))
+    def _roulette(self, u): return self.games, self.games.roulette, (random.randint(10, 200), random.choice(["red", "black", "7"]))
+    def _shop(self, u):     return self.shop, self.shop.shop, ()
+    def _buy(self, u):      return self.shop, self.shop.buy_shop_item, (random.choice(["shield", "fishing_rod", "pickaxe"]),)
+    def _inventory(self, u): return self.shop, self.shop.inventory, ()
+    def _fish(self, u):     return self.shop, self.shop.fish, ()
+    def _level(self, u):    return self.xp, self.xp.show_level, ()
+    def _rank(self, u):     return self.xp, self.xp.show_rank, ()
+    def _priemer(self, u):  return self.work, self.work.priemer_cmd, ()
+    def _message(self, u):  return None, None, self._on_message(u)
+    def _work(self, u):     return None, None, self._work_step(u)
+
+    async def _on_message(self, user):
+        await self.xp.on_message(FakeMessage(self.guild.channel, user, "привет"))
+
+    async def _work_step(self, user):
+        """Один шаг смены на складе: !gb или нажатие кнопки активной работы."""
+        state = self.views.get(user.id)
+        if state is None:
+            await self.work.start_job.callback(self.work, self._ctx(user))
+            view = self.guild.channel.last_view
+            self.views[user.id] = (view, FakeMessage(self.guild.channel, view=view))
+            return
+        view, msg = state
+        view = msg.view or view
+        inter = FakeInteraction(self.guild, user, msg)
+        if hasattr(view, "pick_btn") and view.pick_btn in view.children:
+            await view._pick(inter)
+        elif hasattr(view, "selected_box"):
+            if view.selected_box is None:
+                box = "ABCDE"[min(4, (view.order_size - 1) // 6)]
+                await view._select_box(inter, box)
+            elif view.remaining > 0:
+                await view._collect(inter)
+            else:
+                self.views.pop(user.id, None)
+        elif str(user.id) in self.work_orders():
+            await view._finish(inter)
+        else:
+            self.views.pop(user.id, None)
+
+    @staticmethod
+    def work_orders():
+        from data import ORDERS
+        return ORDERS
+
+
+MIX = {
+    "message": 30, "money": 6, "pay": 5, "deposit": 3, "withdraw": 3, "top": 3,
+    "toplevel": 2, "daily": 2, "rob": 3, "crime": 3, "bj": 3, "flip": 4, "spin": 4,
+    "dice": 3, "roulette": 3, "shop": 1, "buy": 2, "inventory": 2, "fish": 2,
+    "level": 3, "rank": 2, "priemer": 1, "work": 8,
+}
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+async def run(args):
+    from cogs.economy import EconomyCog
+    from cogs.games import GamesCog
+    from cogs.shop import ShopCog
+    from cogs.work import WorkCog
+    from cogs.xp import XPCog
+    import cogs.work
+    import data
+    from storage import drain
+
+    if not args.real_sleep:
+        _skip_sleeps(cogs.work)
+        cogs.work.PICK_TIMERS = _InstantTimers()
+    _count_persistence()
+
+    random.seed(args.seed)
+    bot    = FakeBot(asyncio.get_running_loop())
+    guild  = FakeGuild(args.users)
+    cogs_  = (EconomyCog(bot), GamesCog(bot), ShopCog(bot), WorkCog(bot), XPCog(bot))
+    driver = Driver(bot, guild, cogs_)
+    for uid in guild.members:
+        data.player_funds[str(uid)] = 10_000
+
+    names, weights = zip(*MIX.items())
+    timings  = defaultdict(list)
+    errors   = defaultdict(int)
+    interval = 1 / args.rate if args.rate > 0 else 0
+    sem      = asyncio.Semaphore(args.concurrency)
+
+    async def one(name, user):
+        async with sem:
+            t0 = time.perf_counter()
+            try:
+                await driver.run(name, user)
+            except Exception as e:
+                errors[f"{name}: {type(e).__name__}"] += 1
+            timings[name].append(time.perf_counter() - t0)
+
+    start   = time.perf_counter()
+    pending = set()
+    for i, name in enumerate(random.choices(names, weights, k=args.commands)):
+        if interval:
+            delay = start + i * interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        pending.add(asyncio.ensure_future(one(name, random.choice(driver.users))))
+        if len(pending) >= args.concurrency * 4:
+            _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+    if pending:
+        await asyncio.wait(pending)
+    elapsed = time.perf_counter() - start
+
+    t0 = time.perf_counter()
+    data.flush_dirty()
+    drain()
+    flush = time.perf_counter() - t0
+
+    total = sum(len(v) for v in timings.values())
+    print(f"Бэкенд: {data.STORAGE_BACKEND} | игроков: {args.users} | команд: {total}")
+    print(f"Время: {elapsed:.2f} с | {total / elapsed:,.0f} команд/с | вызовов API: {guild.channel.api_calls:,}")
+    print(f"На диск: {PERSIST['bytes'] / 1024:,.1f} КиБ за {PERSIST['writes']} записей "
+          f"(финальный сброс {flush * 1e3:.1f} мс)\n")
+    print(f"{'команда':<10} {'кол-во':>7} {'p50, мс':>9} {'p99, мс':>9} {'max, мс':>9}")
+    everything = []
+    for name in sorted(timings, key=lambda n: -len(timings[n])):
+        t = sorted(timings[name])
+        everything.extend(t)
+        print(f"{name:<10} {len(t):>7} {percentile(t, 50) * 1e3:>9.3f} "
+              f"{percentile(t, 99) * 1e3:>9.3f} {t[-1] * 1e3:>9.3f}")
+    everything.sort()
+    print(f"{'всего':<10} {len(everything):>7} {percentile(everything, 50) * 1e3:>9.3f} "
+          f"{percentile(everything, 99) * 1e3:>9.3f} {everything[-1] * 1e3:>9.3f}")
+    if errors:
+        print("\nОшибки:")
+        for key, n in sorted(errors.items(), key=lambda kv: -kv[1]):
+            print(f"  {key}: {n}")
+
+    for task in asyncio.all_tasks():
+        if task is not asyncio.current_task():
+            task.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users",       type=int,   default=200)
+    parser.add_argument("--commands",    type=int,   default=20_000)
+    parser.add_argument("--rate",        type=float, default=0, help="команд в секунду, 0 — без ограничения")
+    parser.add_argument("--concurrency", type=int,   default=50)
+    parser.add_argument("--seed",        type=int,   default=1)
+    parser.add_argument("--real-sleep",  action="store_true")
+    args = parser.parse_args()
+
+    # данные бота — во временной папке, рабочие файлы репозитория не трогаем
+    sys.path.insert(0, os.getcwd())
+    workdir = tempfile.mkdtemp(prefix="bazarcik-load-")
+    os.chdir(workdir)
+    print(f"Данные: {workdir}")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
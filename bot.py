@@ -39,18 +39,8 @@ bot = commands.Bot(command_prefix="!", intents=intents, case_insensitive=True)
 # ============================================================
 #  UNIVERSAL JSON HELPERS
 # ============================================================
-def load_json(path, default=None):
-    if default is None:
-        default = {}
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return default if not isinstance(default, type) else default()
-
-def save_json(path, data):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+# Запись идёт в фоновом потоке storage, см. storage.py
+from storage import load_json, save_json
 
 # ============================================================
 #  DATA FILES & GLOBAL STATE
@@ -3702,9 +3692,7 @@ async def petition(ctx, *, text: str = None):
     if not text:
         await ctx.send("❗ `!petition <текст>`", delete_after=10); return
 
-    try:
-        with open("petitions.json","r",encoding="utf-8") as f: petitions = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError): petitions = []
+    petitions = load_json("petitions.json", [])
 
     pid      = len(petitions) + 1
     required = max(1, int(ctx.guild.member_count * 0.1) - 1)
@@ -3715,14 +3703,14 @@ async def petition(ctx, *, text: str = None):
         "reviews": {"yes": [], "no": []},
     }
     petitions.append(data)
-    with open("petitions.json","w",encoding="utf-8") as f: json.dump(petitions, f, indent=4)
+    save_json("petitions.json", petitions)
 
     msg = await ctx.send(
         f"📜 **Петиция №{pid}**\n{text}\n\n"
         f"Автор: <@{ctx.author.id}>\nПодписей: 0/{required}\n👮 Голоса: 0/3\n\n"
         f"✍️ `!vote {pid}`")
     data["message_id"] = msg.id
-    with open("petitions.json","w",encoding="utf-8") as f: json.dump(petitions, f, indent=4)
+    save_json("petitions.json", petitions)
 
 @bot.command(
     name="vote",
@@ -3745,9 +3733,9 @@ async def vote_petition(ctx, petition_id: int = None):
     if petition_id is None:
         await ctx.send("❗ `!vote <номер>`", delete_after=10); return
 
-    try:
-        with open("petitions.json","r",encoding="utf-8") as f: petitions = json.load(f)
-    except: await ctx.send("Нет петиций.", delete_after=5); return
+    petitions = load_json("petitions.json", [])
+    if not petitions:
+        await ctx.send("Нет петиций.", delete_after=5); return
 
     p = next((x for x in petitions if x["id"] == petition_id), None)
     if not p:
@@ -3759,7 +3747,7 @@ async def vote_petition(ctx, petition_id: int = None):
 
     p["votes"] += 1
     p["voters"].append(str(ctx.author.id))
-    with open("petitions.json","w",encoding="utf-8") as f: json.dump(petitions, f, indent=4)
+    save_json("petitions.json", petitions)
 
     av = len(p.get("reviews",{}).get("yes",[])) + len(p.get("reviews",{}).get("no",[]))
     content = (f"📜 **Петиция №{p['id']}**\n{p['text']}\n\n"
@@ -3811,9 +3799,9 @@ async def _handle_admin_vote(ctx, petition_id: int, vote_type: str):
     if not ctx.author.guild_permissions.administrator:
         await ctx.send("Только администратор!", delete_after=5); return
 
-    try:
-        with open("petitions.json","r",encoding="utf-8") as f: petitions = json.load(f)
-    except: await ctx.send("Нет петиций.", delete_after=5); return
+    petitions = load_json("petitions.json", [])
+    if not petitions:
+        await ctx.send("Нет петиций.", delete_after=5); return
 
     for p in petitions:
         if p["id"] == petition_id:
@@ -3833,7 +3821,7 @@ async def _handle_admin_vote(ctx, petition_id: int, vote_type: str):
                 p["status"] = "approved" if len(p["reviews"]["yes"]) > len(p["reviews"]["no"]) else "rejected"
                 result      = "✅ Одобрена" if p["status"] == "approved" else "❌ Отклонена"
 
-            with open("petitions.json","w",encoding="utf-8") as f: json.dump(petitions, f, indent=4)
+            save_json("petitions.json", petitions)
 
             content = (f"📜 **Петиция №{p['id']}**\n{p['text']}\n\n"
                       f"Автор: <@{p['author']}>\nПодписей: {p['votes']}/{p['required_votes']}\n"
@@ -3867,9 +3855,9 @@ async def _handle_admin_vote(ctx, petition_id: int, vote_type: str):
 )
 async def list_petitions(ctx):
     await ctx.message.delete()
-    try:
-        with open("petitions.json","r",encoding="utf-8") as f: petitions = json.load(f)
-    except: await ctx.send("Нет петиций.", delete_after=5); return
+    petitions = load_json("petitions.json", [])
+    if not petitions:
+        await ctx.send("Нет петиций.", delete_after=5); return
 
     active = [p for p in petitions if p["status"] == "active"]
     if not active:
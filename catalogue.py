@@ -0,0 +1,99 @@
+"""
+catalogue.py — заранее посчитанный каталог склада и пакетная генерация заказов.
+Все пары (бренд, товар) и все 4032 ячейки склада (3B1A1 … 3C56J4) строятся
+один раз. Позиции заказа выбираются индексами, пачками по несколько тысяч
+(через NumPy, если он установлен), так что один заказ — это срез готового
+буфера, а не десятки random.choice и склеек строк. Распределение то же, что
+у старого generate_order: бренд равновероятно, затем товар внутри бренда.
+"""
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ROWS      = "BC"
+AISLES    = range(1, 57)
+SHELVES   = "ABCDEFGHJ"
+LEVELS    = range(1, 5)
+MAX_ORDER = 30
+
+
+class Catalogue:
+    def __init__(self, items_by_brand: dict, batch: int = 4096, seed=None):
+        self.items      = []   # "Бренд - Товар"
+        self.item_names = []   # "Товар" — для баления
+        self._offsets   = []   # индекс первого товара бренда в items
+        self._sizes     = []   # товаров у бренда
+        for brand, items in items_by_brand.items():
+            self._offsets.append(len(self.items))
+            self._sizes.append(len(items))
+            self.items.extend(f"{brand} - {item}" for item in items)
+            self.item_names.extend(items)
+        self.locations = [f"3{r}{a}{s}{l}" for r in ROWS for a in AISLES for s in SHELVES for l in LEVELS]
+        self.batch     = batch
+        self._random   = random.Random(seed)
+        self._rng      = np.random.default_rng(seed) if np is not None else None
+        self._locs     = []
+        self._picks    = []
+        self._pos      = 0
+        if np is not None:
+            self._np_offsets = np.array(self._offsets)
+            self._np_sizes   = np.array(self._sizes)
+
+    # ── Выборка индексов ──────────────────────────────────────
+    def sample(self, n: int):
+        """n случайных позиций: (индексы ячеек, индексы товаров) — списки int."""
+        if n <= 0:
+            return [], []
+        if np is not None:
+            brands = self._rng.integers(0, len(self._sizes), n)
+            picks  = self._np_offsets[brands] + (self._rng.random(n) * self._np_sizes[brands]).astype(np.int64)
+            locs   = self._rng.integers(0, len(self.locations), n)
+            return locs.tolist(), picks.tolist()
+        rnd, offsets, sizes = self._random, self._offsets, self._sizes
+        nb, nl = len(sizes), len(self.locations)
+        picks  = []
+        for _ in range(n):
+            b = int(rnd.random() * nb)
+            picks.append(offsets[b] + int(rnd.random() * sizes[b]))
+        return [int(rnd.random() * nl) for _ in range(n)], picks
+
+    def _take(self, n: int):
+        if self._pos + n > len(self._picks):
+            self._locs, self._picks = self.sample(max(self.batch, n))
+            self._pos = 0
+        i, self._pos = self._pos, self._pos + n
+        return self._locs[i:self._pos], self._picks[i:self._pos]
+
+    # ── Заказы ────────────────────────────────────────────────
+    def order(self, size: int = None) -> list:
+        """Один заказ: [(ячейка, "Бренд - Товар")] из буфера, пополняемого пачками."""
+        if size is None:
+            size = self._random.randint(1, MAX_ORDER)
+        locs, picks = self._take(size)
+        L, I = self.locations, self.items
+        return [(L[l], I[p]) for l, p in zip(locs, picks)]
+
+    def orders(self, count: int) -> list:
+        """count заказов за одну выборку — для симуляций и бенчмарков."""
+        if np is not None:
+            sizes = self._rng.integers(1, MAX_ORDER + 1, count).tolist()
+        else:
+            sizes = [self._random.randint(1, MAX_ORDER) for _ in range(count)]
+        locs, picks = self.sample(sum(sizes))
+        L, I   = self.locations, self.items
+        result = []
+        start  = 0
+        for size in sizes:
+            end = start + size
+            result.append([(L[l], I[p]) for l, p in zip(locs[start:end], picks[start:end])])
+            start = end
+        return result
+
+    def item_names_sample(self, n: int) -> list:
+        """n названий товаров без бренда (баление)."""
+        _, picks = self._take(n)
+        names    = self.item_names
+        return [names[p] for p in picks]
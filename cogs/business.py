@@ -6,8 +6,9 @@ from discord.ext import commands, tasks
 from data import (
     player_funds, player_businesses, server_effects,
     business_types, unique_items_biz,
-    save_funds, save_businesses, save_server_eff,
+    save_funds, save_businesses, save_server_eff, OUTBOX, DELETE_QUEUE,
 )
+from outbox import BROADCAST
 
 INCOME_CHANNEL_ID = 1353724972677201980
 
@@ -55,7 +56,7 @@ class BusinessCog(commands.Cog):
 
     @commands.command(name="buy_business", brief="Купить бизнес")
     async def buy_business(self, ctx, business_name: str, *, custom_name: str):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         uid = str(ctx.author.id)
 
         if business_name not in business_types:
@@ -87,7 +88,7 @@ class BusinessCog(commands.Cog):
 
     @commands.command(name="sell_business", brief="Продать свой бизнес")
     async def sell_business_cmd(self, ctx, *, business_name: str):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         uid = str(ctx.author.id)
         for b in player_businesses.get(uid, []):
             if b["name"] == business_name:
@@ -101,7 +102,7 @@ class BusinessCog(commands.Cog):
 
     @commands.command(name="upgrade_business", brief="Улучшить бизнес для роста прибыли")
     async def upgrade_business_cmd(self, ctx, *, business_name: str):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         uid = str(ctx.author.id)
         for b in player_businesses.get(uid, []):
             if b["name"] == business_name:
@@ -126,7 +127,7 @@ class BusinessCog(commands.Cog):
 
     @commands.command(name="repair_business", brief="Отремонтировать бизнес")
     async def repair_business_cmd(self, ctx, *, business_name: str):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         uid = str(ctx.author.id)
         for b in player_businesses.get(uid, []):
             if b["name"] == business_name:
@@ -141,7 +142,7 @@ class BusinessCog(commands.Cog):
 
     @commands.command(name="businesses", brief="Список своих бизнесов")
     async def list_businesses(self, ctx, member: discord.Member = None):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         if member is None: member = ctx.author
         uid   = str(member.id)
         blist = player_businesses.get(uid, [])
@@ -158,7 +159,7 @@ class BusinessCog(commands.Cog):
 
     @commands.command(name="business_info", brief="Информация о типах бизнесов")
     async def business_info_cmd(self, ctx):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         embed = discord.Embed(title="📋 Типы бизнесов", color=discord.Color.blue())
         for name, d in business_types.items():
             embed.add_field(
@@ -171,13 +172,13 @@ class BusinessCog(commands.Cog):
 
     @commands.command(name="use_item", brief="Применить уникальный эффект бизнеса")
     async def use_item_biz_cmd(self, ctx, *, business_type: str):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         uid = str(ctx.author.id)
         await ctx.send(_apply_biz_unique(uid, business_type))
 
     @commands.command(name="active_effects", brief="Посмотреть активные серверные эффекты")
     async def active_effects_cmd(self, ctx):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         check_active_effects()
         if not server_effects:
             await ctx.send("❌ Нет активных эффектов.", delete_after=5); return
@@ -189,7 +190,7 @@ class BusinessCog(commands.Cog):
 
     @commands.command(name="business_help", brief="Гайд по системе бизнесов")
     async def business_help_cmd(self, ctx):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         try:
             with open("business_help.txt", "r", encoding="utf-8") as f:
                 await ctx.send(f.read())
@@ -218,8 +219,9 @@ class BusinessCog(commands.Cog):
                 if total > 0:
                     player_funds[uid] = player_funds.get(uid, 0) + total
                     if channel:
-                        try: await channel.send(f"💼 <@{uid}> получил прибыль от бизнесов: **{total:,}** 💰")
-                        except Exception: pass
+                        # рассылка: строки склеиваются в сообщения до 2000 символов
+                        OUTBOX.post(channel, f"💼 <@{uid}> получил прибыль от бизнесов: **{total:,}** 💰",
+                                    priority=BROADCAST)
             save_funds()
 
     @tasks.loop(hours=1)
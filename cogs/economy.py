@@ -1,12 +1,11 @@
 import random
-import time
 from datetime import datetime, timezone
 import discord
 from discord.ext import commands
 from data import (
-    player_funds, player_bank, player_daily, player_xp,
+    player_funds, player_bank, player_daily,
     DAILY_REWARDS, TAX_THRESHOLD, ROB_CD, CRIME_CD, SHOP_ITEMS,
-    player_inventory,
+    player_inventory, WEALTH_RANK, XP_RANK, NAME_CACHE, LEDGER, DELETE_QUEUE,
     save_funds, save_bank, save_daily, save_inventory,
 )
 
@@ -32,7 +31,7 @@ class EconomyCog(commands.Cog):
     # ── Balance ───────────────────────────────────────────────
     @commands.command(name="money", brief="Проверить баланс")
     async def check_funds(self, ctx):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         await init_player(self.bot, ctx)
         uid  = str(ctx.author.id)
         cash = player_funds.get(uid, 0)
@@ -46,86 +45,95 @@ class EconomyCog(commands.Cog):
 
     @commands.command(name="pay", brief="Перевести деньги другому игроку")
     async def pay(self, ctx, member: discord.Member, amount: int):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         sender   = str(ctx.author.id)
         receiver = str(member.id)
         if amount <= 0:
             await ctx.send(f"{ctx.author.mention}, сумма должна быть > 0!", delete_after=5); return
-        if player_funds.get(sender, 0) < amount:
+        if sender == receiver:
+            await ctx.send(f"{ctx.author.mention}, нельзя перевести самому себе!", delete_after=5); return
+        async with LEDGER.transaction(sender, receiver) as tx:
+            ok = tx.get("funds", sender) >= amount
+            if ok:
+                tx.move(("funds", sender), ("funds", receiver), amount)
+        if not ok:
             await ctx.send(f"{ctx.author.mention}, недостаточно средств!", delete_after=5); return
-        player_funds[sender] -= amount
-        player_funds[receiver] = player_funds.get(receiver, 0) + amount
-        save_funds()
         await ctx.send(f"💸 {ctx.author.mention} перевёл **{amount:,}** 💰 → {member.mention}")
 
     @commands.command(name="deposit", brief="Положить деньги в банк")
     async def deposit(self, ctx, amount: int):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         await init_player(self.bot, ctx)
         uid = str(ctx.author.id)
-        if amount <= 0 or player_funds.get(uid, 0) < amount:
+        async with LEDGER.transaction(uid) as tx:
+            ok = 0 < amount <= tx.get("funds", uid)
+            if ok:
+                tx.move(("funds", uid), ("bank", uid), amount)
+                bank = tx.get("bank", uid)
+        if not ok:
             await ctx.send("❌ Неверная сумма или недостаточно наличных!", delete_after=5); return
-        player_funds[uid] -= amount
-        player_bank[uid]   = player_bank.get(uid, 0) + amount
-        save_funds(); save_bank()
-        await ctx.send(f"🏦 {ctx.author.mention} внёс **{amount:,}** в банк. Банк: **{player_bank[uid]:,}** 💰")
+        await ctx.send(f"🏦 {ctx.author.mention} внёс **{amount:,}** в банк. Банк: **{bank:,}** 💰")
 
     @commands.command(name="withdraw", brief="Снять деньги из банка")
     async def withdraw(self, ctx, amount: int):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         await init_player(self.bot, ctx)
         uid = str(ctx.author.id)
-        if amount <= 0 or player_bank.get(uid, 0) < amount:
+        async with LEDGER.transaction(uid) as tx:
+            ok = 0 < amount <= tx.get("bank", uid)
+            if ok:
+                tx.move(("bank", uid), ("funds", uid), amount)
+                cash = tx.get("funds", uid)
+        if not ok:
             await ctx.send("❌ Неверная сумма или недостаточно в банке!", delete_after=5); return
-        player_bank[uid]  -= amount
-        player_funds[uid]  = player_funds.get(uid, 0) + amount
-        save_funds(); save_bank()
-        await ctx.send(f"💰 {ctx.author.mention} снял **{amount:,}** из банка. Наличные: **{player_funds[uid]:,}** 💰")
+        await ctx.send(f"💰 {ctx.author.mention} снял **{amount:,}** из банка. Наличные: **{cash:,}** 💰")
 
     # ── Leaderboards ──────────────────────────────────────────
     @commands.command(name="top", brief="Топ-10 богатейших игроков")
-    async def leaderboard(self, ctx):
-        await ctx.message.delete()
-        combined = {}
-        for uid in set(list(player_funds.keys()) + list(player_bank.keys())):
-            combined[uid] = player_funds.get(uid, 0) + player_bank.get(uid, 0)
-        top    = sorted(combined.items(), key=lambda x: x[1], reverse=True)[:10]
+    async def leaderboard(self, ctx, page: int = 1):
+        DELETE_QUEUE.add(ctx.message)
+        page   = max(1, page)
+        offset = (page - 1) * 10
+        top    = WEALTH_RANK.top(10, offset)
+        names  = await NAME_CACHE.resolve(ctx.guild, [uid for uid, _ in top])
         medals = ["🥇","🥈","🥉","4️⃣","5️⃣","6️⃣","7️⃣","8️⃣","9️⃣","🔟"]
         lines  = []
         for i, (uid, total) in enumerate(top):
-            try:
-                m    = ctx.guild.get_member(int(uid)) or await ctx.guild.fetch_member(int(uid))
-                name = m.display_name
-            except Exception:
-                name = f"<@{uid}>"
-            lines.append(f"{medals[i]} **{name}** — {total:,} 💰")
-        embed = discord.Embed(title="💎 Топ-10 богатейших", color=discord.Color.gold(),
+            place = medals[i] if page == 1 else f"**{offset + i + 1}.**"
+            lines.append(f"{place} **{names[uid]}** — {total:,} 💰")
+        title = "💎 Топ-10 богатейших" if page == 1 else f"💎 Богатейшие — страница {page}"
+        embed = discord.Embed(title=title, color=discord.Color.gold(),
                               description="\n".join(lines) or "—")
+        my_rank = WEALTH_RANK.rank(str(ctx.author.id))
+        if my_rank:
+            embed.set_footer(text=f"Твоё место: {my_rank} из {len(WEALTH_RANK)} | !top <страница>")
         await ctx.send(embed=embed)
 
     @commands.command(name="toplevel", brief="Топ-10 игроков по уровню")
-    async def top_level(self, ctx):
-        await ctx.message.delete()
+    async def top_level(self, ctx, page: int = 1):
+        DELETE_QUEUE.add(ctx.message)
         from cogs.xp import get_level
-        top    = sorted(player_xp.items(), key=lambda x: x[1], reverse=True)[:10]
+        page   = max(1, page)
+        offset = (page - 1) * 10
+        top    = XP_RANK.top(10, offset)
+        names  = await NAME_CACHE.resolve(ctx.guild, [uid for uid, _ in top])
         medals = ["🥇","🥈","🥉","4️⃣","5️⃣","6️⃣","7️⃣","8️⃣","9️⃣","🔟"]
         lines  = []
         for i, (uid, xp) in enumerate(top):
             lvl, _ = get_level(xp)
-            try:
-                m    = ctx.guild.get_member(int(uid)) or await ctx.guild.fetch_member(int(uid))
-                name = m.display_name
-            except Exception:
-                name = f"<@{uid}>"
-            lines.append(f"{medals[i]} **{name}** — Lvl {lvl} ({xp:,} XP)")
-        embed = discord.Embed(title="⭐ Топ-10 по уровням", color=discord.Color.blurple(),
+            place = medals[i] if page == 1 else f"**{offset + i + 1}.**"
+            lines.append(f"{place} **{names[uid]}** — Lvl {lvl} ({xp:,} XP)")
+        title = "⭐ Топ-10 по уровням" if page == 1 else f"⭐ Уровни — страница {page}"
+        embed = discord.Embed(title=title, color=discord.Color.blurple(),
                               description="\n".join(lines) or "—")
+        pages = max(1, (len(XP_RANK) + 9) // 10)
+        embed.set_footer(text=f"Страница {page}/{pages} | !toplevel <страница> | !rank")
         await ctx.send(embed=embed)
 
     # ── Daily ─────────────────────────────────────────────────
     @commands.command(name="daily", brief="Получить ежедневный бонус")
     async def daily_bonus(self, ctx):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         await init_player(self.bot, ctx)
         uid  = str(ctx.author.id)
         now  = datetime.now(timezone.utc)
@@ -158,7 +166,7 @@ class EconomyCog(commands.Cog):
     # ── Rob ───────────────────────────────────────────────────
     @commands.command(name="rob", brief="Ограбить другого игрока")
     async def rob(self, ctx, member: discord.Member):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         await init_player(self.bot, ctx)
         robber = str(ctx.author.id)
         victim = str(member.id)
@@ -176,39 +184,44 @@ class EconomyCog(commands.Cog):
             await ctx.send(f"🛡️ {member.mention} был защищён щитом! {ctx.author.mention} ушёл ни с чем.", delete_after=10)
             return
 
-        now = time.time()
-        if now - ROB_CD.get(robber, 0) < 3600:
-            rem = int(3600 - (now - ROB_CD.get(robber, 0)))
+        rem = ROB_CD.remaining(robber)
+        if rem > 0:
+            rem = int(rem)
             await ctx.send(f"⏳ Следующее ограбление через **{rem//60}мин {rem%60}сек**.", delete_after=10); return
 
-        victim_cash = player_funds.get(victim, 0)
-        if victim_cash < 200:
+        async with LEDGER.transaction(robber, victim) as tx:
+            victim_cash = tx.get("funds", victim)
+            if ROB_CD.remaining(robber) > 0:
+                outcome = "cooldown"   # параллельный !rob успел раньше
+            elif victim_cash < 200:
+                outcome = "poor"
+            else:
+                ROB_CD.set(robber)
+                outcome = "success" if random.random() < 0.45 else "caught"
+                if outcome == "success":
+                    amount = random.randint(100, min(5000, int(victim_cash * 0.3)))
+                    tx.move(("funds", victim), ("funds", robber), amount)
+                else:
+                    fine = random.randint(200, 1500)
+                    tx.add("funds", robber, -min(fine, tx.get("funds", robber)))
+        if outcome == "cooldown":
+            return
+        if outcome == "poor":
             await ctx.send(f"💸 {member.mention} слишком беден — не стоит рисковать!", delete_after=5); return
-
-        ROB_CD[robber] = now
-        if random.random() < 0.45:
-            amount = random.randint(100, min(5000, int(victim_cash * 0.3)))
-            player_funds[victim]  = victim_cash - amount
-            player_funds[robber]  = player_funds.get(robber, 0) + amount
-            save_funds()
+        if outcome == "success":
             await ctx.send(f"🦹 {ctx.author.mention} ограбил {member.mention} на **{amount:,}** 💰!")
         else:
-            fine = random.randint(200, 1500)
-            player_funds[robber] = max(0, player_funds.get(robber, 0) - fine)
-            save_funds()
             await ctx.send(f"👮 {ctx.author.mention} попался и заплатил штраф **{fine:,}** 💰!")
 
     # ── Crime ─────────────────────────────────────────────────
     @commands.command(name="crime", brief="Совершить преступление (заработок/риск)")
     async def crime(self, ctx):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         await init_player(self.bot, ctx)
         uid = str(ctx.author.id)
-        now = time.time()
-        if now - CRIME_CD.get(uid, 0) < 1800:
-            rem = int(1800 - (now - CRIME_CD.get(uid, 0)))
-            await ctx.send(f"⏳ Следующее преступление через **{rem//60}мин**.", delete_after=10); return
-        CRIME_CD[uid] = now
+        rem = CRIME_CD.check_and_set(uid)
+        if rem:
+            await ctx.send(f"⏳ Следующее преступление через **{int(rem)//60}мин**.", delete_after=10); return
 
         crimes = [
             ("карманную кражу",       200,  800),
@@ -234,7 +247,7 @@ class EconomyCog(commands.Cog):
     @commands.command(name="give", brief="[Админ] Выдать деньги участнику")
     @commands.has_permissions(administrator=True)
     async def give_money(self, ctx, member: discord.Member, amount: int):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         uid = str(member.id)
         player_funds[uid] = player_funds.get(uid, 0) + amount
         save_funds()
@@ -243,7 +256,7 @@ class EconomyCog(commands.Cog):
     @commands.command(name="take", brief="[Админ] Снять деньги с участника")
     @commands.has_permissions(administrator=True)
     async def take_money(self, ctx, member: discord.Member, amount: int):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         uid = str(member.id)
         player_funds[uid] = max(0, player_funds.get(uid, 0) - amount)
         save_funds()
@@ -252,7 +265,7 @@ class EconomyCog(commands.Cog):
     @commands.command(name="setmoney", brief="[Админ] Установить баланс участника")
     @commands.has_permissions(administrator=True)
     async def set_money(self, ctx, member: discord.Member, amount: int):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         uid = str(member.id)
         player_funds[uid] = amount
         save_funds()
@@ -2,7 +2,7 @@ import random
 import asyncio
 import discord
 from discord.ext import commands
-from data import player_funds, TAX_THRESHOLD, REDS, card_values, suits, save_funds
+from data import player_funds, TAX_THRESHOLD, REDS, card_values, suits, save_funds, LEDGER, OUTBOX, DELETE_QUEUE
 from cogs.economy import init_player, calculate_tax
 
 
@@ -27,15 +27,19 @@ class GamesCog(commands.Cog):
     # ── Blackjack ─────────────────────────────────────────────
     @commands.command(name="bj", brief="Сыграть в Блэкджек")
     async def blackjack(self, ctx, bet: int):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         await init_player(self.bot, ctx)
         uid = str(ctx.author.id)
 
-        if bet <= 0 or bet > player_funds.get(uid, 0):
+        # Ставка списывается сразу и атомарно; выигрыш — отдельной транзакцией,
+        # так что замок не держится, пока игрок думает над !hit / !stand.
+        async with LEDGER.transaction(uid) as tx:
+            ok = 0 < bet <= tx.get("funds", uid)
+            if ok:
+                tx.add("funds", uid, -bet)
+        if not ok:
             await ctx.send("❌ Неверная ставка!", delete_after=5); return
 
-        player_funds[uid] -= bet
-        save_funds()
         deck = create_deck()
         ph   = [deck.pop(), deck.pop()]
         dh   = [deck.pop(), deck.pop()]
@@ -43,15 +47,16 @@ class GamesCog(commands.Cog):
         def fmt(hand):
             return ", ".join(f"{c}{suits[s]}" for c, s in hand)
 
-        await ctx.send(f"🃏 {ctx.author.mention} начал Блэкджек. Ставка: **{bet:,}**")
-        await ctx.send(f"Ваши карты: `{fmt(ph)}` (Сумма: **{calculate_hand(ph)}**)")
-        await ctx.send(f"Карты дилера: `{ph[0][0]}{suits[ph[0][1]]}` и скрытая.")
+        # три строки начала раунда уходят одним сообщением
+        OUTBOX.post(ctx.channel, f"🃏 {ctx.author.mention} начал Блэкджек. Ставка: **{bet:,}**")
+        OUTBOX.post(ctx.channel, f"Ваши карты: `{fmt(ph)}` (Сумма: **{calculate_hand(ph)}**)")
+        await OUTBOX.send(ctx.channel, f"Карты дилера: `{ph[0][0]}{suits[ph[0][1]]}` и скрытая.")
 
         if calculate_hand(ph) == 21:
             w   = bet * 3
             tax = calculate_tax(w - bet)
-            player_funds[uid] += w - tax
-            save_funds()
+            async with LEDGER.transaction(uid) as tx:
+                tx.add("funds", uid, w - tax)
             await ctx.send(f"🎉 **БЛЭКДЖЕК!** {ctx.author.mention} выиграл **{w-tax:,}** 💰!")
             return
 
@@ -84,20 +89,20 @@ class GamesCog(commands.Cog):
         if dt > 21 or pt > dt:
             w   = bet * 2
             tax = calculate_tax(w - bet)
-            player_funds[uid] += w - tax
-            save_funds()
+            async with LEDGER.transaction(uid) as tx:
+                tx.add("funds", uid, w - tax)
             await ctx.send(f"🏆 {ctx.author.mention} выиграл **{w-tax:,}** 💰! Баланс: **{player_funds[uid]:,}**")
         elif pt < dt:
             await ctx.send(f"😞 {ctx.author.mention} проиграл. Баланс: **{player_funds[uid]:,}** 💰")
         else:
-            player_funds[uid] += bet
-            save_funds()
+            async with LEDGER.transaction(uid) as tx:
+                tx.add("funds", uid, bet)
             await ctx.send(f"🤝 Ничья! Ставка возвращена. Баланс: **{player_funds[uid]:,}** 💰")
 
     # ── Flip ──────────────────────────────────────────────────
     @commands.command(name="flip", brief="Подбросить монетку на ставку")
     async def flip(self, ctx, bet: int, choice: str):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         await init_player(self.bot, ctx)
         uid = str(ctx.author.id)
 
@@ -127,7 +132,7 @@ class GamesCog(commands.Cog):
     # ── Slots ─────────────────────────────────────────────────
     @commands.command(name="spin", brief="Сыграть в слоты")
     async def spin(self, ctx, bet: int):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         await init_player(self.bot, ctx)
         uid = str(ctx.author.id)
 
@@ -158,7 +163,7 @@ class GamesCog(commands.Cog):
     # ── Dice ──────────────────────────────────────────────────
     @commands.command(name="dice", brief="Угадать число на кубике")
     async def dice_game(self, ctx, bet: int, number: int):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         await init_player(self.bot, ctx)
         uid = str(ctx.author.id)
 
@@ -183,7 +188,7 @@ class GamesCog(commands.Cog):
     # ── Roulette ──────────────────────────────────────────────
     @commands.command(name="roulette", brief="Сыграть в рулетку")
     async def roulette(self, ctx, bet: int, choice: str):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         await init_player(self.bot, ctx)
         uid = str(ctx.author.id)
 
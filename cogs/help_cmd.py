@@ -1,5 +1,6 @@
 import discord
 from discord.ext import commands
+from data import DELETE_QUEUE
 
 
 class MyHelpCommand(commands.HelpCommand):
@@ -7,8 +8,7 @@ class MyHelpCommand(commands.HelpCommand):
     # ── Общий !help ──────────────────────────────────────────
     async def send_bot_help(self, mapping):
         ctx = self.context
-        try: await ctx.message.delete()
-        except Exception: pass
+        DELETE_QUEUE.add(ctx.message)
 
         # Если есть файл help.txt — используем его
         try:
@@ -30,12 +30,13 @@ class MyHelpCommand(commands.HelpCommand):
                 ("`!deposit сумма`",  "Положить деньги в банк"),
                 ("`!withdraw сумма`", "Снять деньги из банка"),
                 ("`!daily`",          "Ежедневный бонус (серия до 3 000 💰)"),
-                ("`!top`",            "Топ-10 богатейших игроков"),
-                ("`!toplevel`",       "Топ-10 по уровню и XP"),
+                ("`!top [страница]`", "Топ богатейших игроков и твоё место"),
+                ("`!toplevel [стр.]`","Топ по уровню и XP (постранично)"),
             ],
             "⭐ Профиль и уровень": [
                 ("`!profile [@user]`","Полный профиль игрока"),
                 ("`!level [@user]`",  "Уровень и XP-прогресс"),
+                ("`!rank [@user]`",   "Место в рейтинге по XP"),
                 ("`!avatar [@user]`", "Аватар в полном размере"),
                 ("`!userinfo [@user]`","Информация об участнике сервера"),
                 ("`!serverinfo`",     "Информация о сервере"),
@@ -78,7 +79,7 @@ class MyHelpCommand(commands.HelpCommand):
             ],
             "📦 Работа на складе": [
                 ("`!gb`",      "Начать смену (пикинг или баление, случайно)"),
-                ("`!priemer`", "Показатель эффективности (влияет на зарплату)"),
+                ("`!priemer`", "Показатель эффективности (влияет на зарплату) и заказы за 1ч/24ч/7д"),
             ],
             "📜 Петиции": [
                 ("`!petition текст`",   "Создать петицию"),
@@ -107,6 +108,9 @@ class MyHelpCommand(commands.HelpCommand):
                 ("`!say текст`",           "Написать от имени бота"),
                 ("`!embed заголовок текст`","Отправить красивый embed"),
                 ("`!announce текст`",      "Объявление с пингом @here"),
+                ("`!msgstats`",            "Статистика обработки сообщений"),
+                ("`!cmdstats [slow|dump]`", "Время выполнения команд"),
+                ("`!looplag`",             "Задержки event loop и их причины"),
             ],
             "🎭 Развлечения": [
                 ("`!joke`",              "Случайная шутка"),
@@ -168,8 +172,7 @@ class MyHelpCommand(commands.HelpCommand):
     # ── !help <команда> ──────────────────────────────────────
     async def send_command_help(self, command):
         ctx = self.context
-        try: await ctx.message.delete()
-        except Exception: pass
+        DELETE_QUEUE.add(ctx.message)
 
         embed = discord.Embed(
             title=f"📋 Справка: !{command.name}",
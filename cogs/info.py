@@ -1,6 +1,6 @@
 import discord
 from discord.ext import commands
-from data import player_funds, player_bank, player_xp, priemer_data, player_warns
+from data import get_player, PRIEMER, DELETE_QUEUE
 from cogs.xp import get_level
 from cogs.economy import init_player
 
@@ -11,16 +11,16 @@ class InfoCog(commands.Cog):
 
     @commands.command(name="profile", brief="Показать профиль игрока")
     async def profile(self, ctx, member: discord.Member = None):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         if member is None: member = ctx.author
         await init_player(self.bot, ctx)
-        uid    = str(member.id)
-        total  = player_xp.get(uid, 0)
+        p      = get_player(member.id)
+        total  = p.get("xp", 0)
         lvl, _ = get_level(total)
-        cash   = player_funds.get(uid, 0)
-        bank   = player_bank.get(uid, 0)
-        pm     = priemer_data.get(uid, 0)
-        warns  = len(player_warns.get(uid, []))
+        cash   = p.get("funds", 0)
+        bank   = p.get("bank", 0)
+        pm     = PRIEMER.get(str(member.id))
+        warns  = len(p.get("warns", []))
 
         embed = discord.Embed(title=f"👤 Профиль {member.display_name}", color=discord.Color.blurple())
         embed.set_thumbnail(url=member.display_avatar.url)
@@ -35,7 +35,7 @@ class InfoCog(commands.Cog):
 
     @commands.command(name="userinfo", brief="Информация об участнике сервера")
     async def user_info(self, ctx, member: discord.Member = None):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         if member is None: member = ctx.author
         embed = discord.Embed(title=f"👤 {member.display_name}", color=discord.Color.blue())
         embed.set_thumbnail(url=member.display_avatar.url)
@@ -48,7 +48,7 @@ class InfoCog(commands.Cog):
 
     @commands.command(name="serverinfo", brief="Информация о сервере")
     async def server_info(self, ctx):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         g     = ctx.guild
         embed = discord.Embed(title=f"🖥️ {g.name}", color=discord.Color.green())
         embed.add_field(name="ID",        value=str(g.id))
@@ -62,7 +62,7 @@ class InfoCog(commands.Cog):
 
     @commands.command(name="moneyhelp", brief="Гайд по денежной системе")
     async def moneyhelp(self, ctx):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         try:
             with open("moneyhelp.txt", "r", encoding="utf-8") as f:
                 await ctx.send(f.read())
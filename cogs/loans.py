@@ -2,7 +2,7 @@ from datetime import datetime, timedelta
 import pytz
 import discord
 from discord.ext import commands, tasks
-from data import player_funds, player_loans, save_funds, save_loans
+from data import player_funds, player_loans, save_funds, save_loans, LEDGER, DELETE_QUEUE
 
 
 async def get_user_age_on_server(ctx, user_id):
@@ -38,7 +38,7 @@ class LoansCog(commands.Cog):
 
     @commands.command(name="applyloan", brief="Оформить кредит")
     async def applyloan(self, ctx, loan_amount: int, loan_term: int):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         uid = str(ctx.author.id)
 
         if player_loans.get(uid):
@@ -76,7 +76,7 @@ class LoansCog(commands.Cog):
 
     @commands.command(name="calculatecredit", brief="Рассчитать кредит до оформления")
     async def calc_credit(self, ctx, loan_amount: int, loan_term: int):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         age   = await get_user_age_on_server(ctx, ctx.author.id) or 0
         rate  = get_loan_rate(age)
         daily = calc_daily_payment(loan_amount, loan_term, rate)
@@ -87,7 +87,7 @@ class LoansCog(commands.Cog):
 
     @commands.command(name="checkloan", brief="Посмотреть статус своего кредита")
     async def check_loan(self, ctx):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         uid = str(ctx.author.id)
         if not player_loans.get(uid):
             await ctx.send(f"{ctx.author.mention}, кредитов нет.", delete_after=5); return
@@ -118,28 +118,36 @@ class LoansCog(commands.Cog):
 
     @commands.command(name="payloan", brief="Погасить кредит (частично или полностью)")
     async def pay_loan(self, ctx, amount: int):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         uid = str(ctx.author.id)
-        if not player_loans.get(uid):
-            await ctx.send("❌ Нет активного кредита.", delete_after=5); return
-        if player_funds.get(uid, 0) < amount:
-            await ctx.send("❌ Недостаточно средств.", delete_after=5); return
-
-        loan      = player_loans[uid][0]
-        total     = int(loan["loan_amount"] * (1 + loan["interest_rate"]))
-        paid      = loan.get("paid_amount", 0)
-        remaining = total - paid
-        amount    = min(amount, remaining)
-
-        player_funds[uid]   -= amount
-        loan["paid_amount"] += amount
-
-        if loan["paid_amount"] >= total:
-            player_loans[uid].pop(0)
-            await ctx.send(f"✅ {ctx.author.mention}, кредит погашен! Баланс: **{player_funds[uid]:,}** 💰")
+        if amount <= 0:
+            await ctx.send("❌ Сумма должна быть > 0.", delete_after=5); return
+        async with LEDGER.transaction(uid) as tx:
+            if not player_loans.get(uid):
+                error = "❌ Нет активного кредита."
+            elif tx.get("funds", uid) < amount:
+                error = "❌ Недостаточно средств."
+            else:
+                error     = None
+                loan      = player_loans[uid][0]
+                total     = int(loan["loan_amount"] * (1 + loan["interest_rate"]))
+                paid      = loan.get("paid_amount", 0)
+                remaining = total - paid
+                amount    = min(amount, remaining)
+
+                tx.add("funds", uid, -amount)
+                loan["paid_amount"] += amount
+                repaid  = loan["paid_amount"] >= total
+                if repaid:
+                    player_loans[uid].pop(0)
+                balance = tx.get("funds", uid)
+                save_loans()
+        if error:
+            await ctx.send(error, delete_after=5); return
+        if repaid:
+            await ctx.send(f"✅ {ctx.author.mention}, кредит погашен! Баланс: **{balance:,}** 💰")
         else:
-            await ctx.send(f"💳 {ctx.author.mention}, внесено **{amount:,}** 💰. Остаток: **{remaining-amount:,}** 💰. Баланс: **{player_funds[uid]:,}**")
-        save_funds(); save_loans()
+            await ctx.send(f"💳 {ctx.author.mention}, внесено **{amount:,}** 💰. Остаток: **{remaining-amount:,}** 💰. Баланс: **{balance:,}**")
 
     @tasks.loop(hours=1)
     async def send_loan_warnings(self):
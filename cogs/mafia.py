@@ -6,7 +6,7 @@ import discord
 from discord.ext import commands
 import edge_tts
 from config import get_groq_client, AI_SYSTEM_PROMPT, TTS_SETTINGS
-from data import MAFIA_DATA
+from data import MAFIA_DATA, COMMAND_METRICS, DELETE_QUEUE
 
 
 # ── AI narrator ───────────────────────────────────────────────
@@ -47,17 +47,18 @@ async def mafia_ai_narrator(prompt_type: str, context_data: str = "") -> str:
         ),
     }
     try:
-        response = await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: get_groq_client().chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[
-                    {"role": "system", "content": AI_SYSTEM_PROMPT},
-                    {"role": "user",   "content": prompts.get(prompt_type, context_data)},
-                ],
-                max_tokens=300,
+        with COMMAND_METRICS.timed("groq"):
+            response = await asyncio.get_event_loop().run_in_executor(
+                None,
+                lambda: get_groq_client().chat.completions.create(
+                    model="llama-3.3-70b-versatile",
+                    messages=[
+                        {"role": "system", "content": AI_SYSTEM_PROMPT},
+                        {"role": "user",   "content": prompts.get(prompt_type, context_data)},
+                    ],
+                    max_tokens=300,
+                )
             )
-        )
         return response.choices[0].message.content.strip()
     except Exception:
         return "Произошла техническая шоколадка, но город проснулся!"
@@ -127,7 +128,8 @@ class MafiaCog(commands.Cog):
         if vc and vc.is_connected():
             try:
                 tts_path = tempfile.mktemp(suffix=".mp3")
-                await edge_tts.Communicate(text, TTS_SETTINGS["voice"]).save(tts_path)
+                with COMMAND_METRICS.timed("tts"):
+                    await edge_tts.Communicate(text, TTS_SETTINGS["voice"]).save(tts_path)
                 while vc.is_playing():
                     await asyncio.sleep(0.5)
                 vc.play(
@@ -244,7 +246,7 @@ class MafiaCog(commands.Cog):
     # ── Commands ──────────────────────────────────────────────
     @commands.command(name="mafia_start")
     async def mafia_start(self, ctx):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         if MAFIA_DATA["is_running"]:
             return await ctx.send("❌ Игра уже идёт! Останови её командой `!mafia_stop`.", delete_after=5)
 
@@ -267,7 +269,7 @@ class MafiaCog(commands.Cog):
 
     @commands.command(name="mafia_go")
     async def mafia_go(self, ctx):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         if not MAFIA_DATA["is_running"] or MAFIA_DATA["phase"] != "waiting":
             return await ctx.send("❌ Нет активного набора! Сначала `!mafia_start`.", delete_after=5)
 
@@ -407,7 +409,7 @@ class MafiaCog(commands.Cog):
     @commands.command(name="morning")
     async def mafia_morning(self, ctx):
         """[Резерв] Ведущий вручную завершает ночь."""
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         if not MAFIA_DATA["is_running"] or MAFIA_DATA["phase"] != "night":
             return await ctx.send("❌ Сейчас не ночная фаза!", delete_after=5)
 
@@ -422,7 +424,7 @@ class MafiaCog(commands.Cog):
     # ── Voting ────────────────────────────────────────────────
     @commands.command(name="mafia_vote")
     async def mafia_vote(self, ctx, number: int):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         if not MAFIA_DATA["is_running"] or MAFIA_DATA["phase"] != "day":
             return await ctx.send("❌ Голосование доступно только днём!", delete_after=5)
 
@@ -506,7 +508,7 @@ class MafiaCog(commands.Cog):
     @commands.command(name="mafia_end_day")
     async def mafia_end_day(self, ctx):
         """[Резерв] Принудительно завершить голосование."""
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         if not MAFIA_DATA["is_running"] or MAFIA_DATA["phase"] != "day":
             return await ctx.send("❌ Сейчас не дневная фаза!", delete_after=5)
         if not MAFIA_DATA["votes"]:
@@ -549,7 +551,7 @@ class MafiaCog(commands.Cog):
     # ── Status / Stop ─────────────────────────────────────────
     @commands.command(name="mafia_status")
     async def mafia_status(self, ctx):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         if not MAFIA_DATA["is_running"]:
             return await ctx.send("❌ Игра не запущена.", delete_after=5)
 
@@ -592,7 +594,7 @@ class MafiaCog(commands.Cog):
 
     @commands.command(name="mafia_stop")
     async def mafia_stop(self, ctx):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         MAFIA_DATA.update({
             "is_running": False, "phase": "waiting", "players": {},
             "actions": {"kill": None, "heal": None, "check": None},
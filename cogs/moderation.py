@@ -2,7 +2,7 @@ import asyncio
 from datetime import datetime, timedelta, timezone
 import discord
 from discord.ext import commands
-from data import player_warns, save_warns
+from data import player_warns, save_warns, DELETE_QUEUE
 
 
 class ModerationCog(commands.Cog):
@@ -12,7 +12,7 @@ class ModerationCog(commands.Cog):
     @commands.command(name="mute", brief="[Админ] Замутить участника")
     @commands.has_permissions(administrator=True)
     async def mute(self, ctx, member: discord.Member, mute_time: int):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         await ctx.send(f"⏳ {member.mention}, у тебя 1 минута перед мутом на **{mute_time}** минут.")
         await asyncio.sleep(60)
         role = discord.utils.get(ctx.guild.roles, name="БАН банан🍌")
@@ -29,7 +29,7 @@ class ModerationCog(commands.Cog):
     @commands.command(name="unmute", brief="[Админ] Снять мут с участника")
     @commands.has_permissions(administrator=True)
     async def unmute(self, ctx, member: discord.Member):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         role = discord.utils.get(ctx.guild.roles, name="БАН банан🍌")
         if role and role in member.roles:
             await member.remove_roles(role)
@@ -40,7 +40,7 @@ class ModerationCog(commands.Cog):
     @commands.command(name="ban", brief="[Админ] Забанить участника")
     @commands.has_permissions(administrator=True)
     async def ban(self, ctx, member: discord.Member, ban_days: int):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         await ctx.send(f"⏳ {member.mention}, у тебя 1 минута перед баном на **{ban_days}** дней.")
         await asyncio.sleep(60)
         await member.ban(reason=f"Бан на {ban_days} дней", delete_message_days=7)
@@ -52,14 +52,14 @@ class ModerationCog(commands.Cog):
     @commands.command(name="kick", brief="[Админ] Кикнуть участника с сервера")
     @commands.has_permissions(administrator=True)
     async def kick(self, ctx, member: discord.Member, *, reason: str = "Не указана"):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         await member.kick(reason=reason)
         await ctx.send(f"👢 {member.mention} выгнан. Причина: **{reason}**")
 
     @commands.command(name="warn", brief="[Админ] Выдать предупреждение участнику")
     @commands.has_permissions(administrator=True)
     async def warn_member(self, ctx, member: discord.Member, *, reason: str = "Не указана"):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         uid = str(member.id)
         if uid not in player_warns: player_warns[uid] = []
         player_warns[uid].append({
@@ -75,7 +75,7 @@ class ModerationCog(commands.Cog):
 
     @commands.command(name="warns", brief="Посмотреть предупреждения игрока")
     async def check_warns(self, ctx, member: discord.Member = None):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         if member is None: member = ctx.author
         uid  = str(member.id)
         wrnl = player_warns.get(uid, [])
@@ -90,7 +90,7 @@ class ModerationCog(commands.Cog):
     @commands.command(name="clearwarn", brief="[Админ] Снять все варны с участника")
     @commands.has_permissions(administrator=True)
     async def clear_warns(self, ctx, member: discord.Member):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         player_warns[str(member.id)] = []
         save_warns()
         await ctx.send(f"✅ Все предупреждения {member.mention} сброшены.")
@@ -128,7 +128,7 @@ class ModerationCog(commands.Cog):
     @commands.command(name="clearuserday", brief="[Админ] Удалить сообщения участника за N дней")
     @commands.has_permissions(administrator=True)
     async def clearuserdays(self, ctx, member: discord.Member, days: int):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         if days <= 0:
             await ctx.send("Дней > 0.", delete_after=5); return
         limit   = datetime.now(timezone.utc) - timedelta(days=days)
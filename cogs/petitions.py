@@ -1,6 +1,7 @@
-import json
 import discord
 from discord.ext import commands
+from storage import load_json, save_json
+from data import DELETE_QUEUE
 
 
 class PetitionsCog(commands.Cog):
@@ -8,19 +9,14 @@ class PetitionsCog(commands.Cog):
         self.bot = bot
 
     def _load(self):
-        try:
-            with open("petitions.json", "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+        return load_json("petitions.json", [])
 
     def _save(self, data):
-        with open("petitions.json", "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
+        save_json("petitions.json", data)
 
     @commands.command(name="petition", brief="Создать петицию")
     async def petition(self, ctx, *, text: str = None):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         if not text:
             await ctx.send("❗ `!petition <текст>`", delete_after=10); return
 
@@ -45,7 +41,7 @@ class PetitionsCog(commands.Cog):
 
     @commands.command(name="vote", brief="Подписать петицию")
     async def vote_petition(self, ctx, petition_id: int = None):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         if petition_id is None:
             await ctx.send("❗ `!vote <номер>`", delete_after=10); return
 
@@ -82,7 +78,7 @@ class PetitionsCog(commands.Cog):
         await self._handle_admin_vote(ctx, petition_id, "no")
 
     async def _handle_admin_vote(self, ctx, petition_id: int, vote_type: str):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         if not ctx.author.guild_permissions.administrator:
             await ctx.send("Только администратор!", delete_after=5); return
 
@@ -124,7 +120,7 @@ class PetitionsCog(commands.Cog):
 
     @commands.command(name="petitions", brief="Список активных петиций")
     async def list_petitions(self, ctx):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         petitions = self._load()
         active = [p for p in petitions if p["status"] == "active"]
         if not active:
@@ -1,10 +1,9 @@
 import random
-import time
 import discord
 from discord.ext import commands
 from data import (
     player_funds, player_inventory, SHOP_ITEMS, FISH_TABLE, FISH_CD,
-    LOTTO_POOL,
+    LOTTO_POOL, DELETE_QUEUE,
     save_funds, save_inventory,
 )
 from cogs.economy import init_player
@@ -17,7 +16,7 @@ class ShopCog(commands.Cog):
     # ── Shop ──────────────────────────────────────────────────
     @commands.command(name="shop", brief="Показать магазин предметов")
     async def shop(self, ctx):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         embed = discord.Embed(title="🏪 Магазин BAZARCIK_PM", color=discord.Color.green())
         for iid, item in SHOP_ITEMS.items():
             embed.add_field(
@@ -29,7 +28,7 @@ class ShopCog(commands.Cog):
 
     @commands.command(name="buy", brief="Купить предмет из магазина")
     async def buy_shop_item(self, ctx, item_id: str):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         await init_player(self.bot, ctx)
         uid = str(ctx.author.id)
         if item_id not in SHOP_ITEMS:
@@ -47,7 +46,7 @@ class ShopCog(commands.Cog):
 
     @commands.command(name="inventory", brief="Показать свой инвентарь")
     async def inventory(self, ctx, member: discord.Member = None):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         if member is None:
             member = ctx.author
         uid = str(member.id)
@@ -61,7 +60,7 @@ class ShopCog(commands.Cog):
 
     @commands.command(name="use", brief="Использовать предмет из инвентаря")
     async def use_item(self, ctx, item_id: str, member: discord.Member = None):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         uid = str(ctx.author.id)
         inv = player_inventory.get(uid, {})
 
@@ -88,7 +87,7 @@ class ShopCog(commands.Cog):
     # ── Lottery ───────────────────────────────────────────────
     @commands.command(name="lotto", brief="Добавить билет в общую лотерею")
     async def lottery(self, ctx):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         await init_player(self.bot, ctx)
         uid = str(ctx.author.id)
         gid = str(ctx.guild.id)
@@ -112,7 +111,7 @@ class ShopCog(commands.Cog):
     @commands.command(name="drawlotto", brief="[Админ] Провести розыгрыш лотереи")
     @commands.has_permissions(administrator=True)
     async def draw_lottery(self, ctx):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         gid = str(ctx.guild.id)
         if gid not in LOTTO_POOL or not LOTTO_POOL[gid]:
             await ctx.send("🎟 Нет билетов в пуле!", delete_after=5); return
@@ -138,19 +137,17 @@ class ShopCog(commands.Cog):
     # ── Fishing ───────────────────────────────────────────────
     @commands.command(name="fish", brief="Порыбачить и заработать деньги")
     async def fish(self, ctx):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         await init_player(self.bot, ctx)
         uid = str(ctx.author.id)
 
         if player_inventory.get(uid, {}).get("fishing_rod", 0) <= 0:
             await ctx.send(f"{ctx.author.mention}, нужна удочка! Купи в `!shop`.", delete_after=5); return
 
-        now = time.time()
-        if now - FISH_CD.get(uid, 0) < 300:
-            rem = int(300 - (now - FISH_CD.get(uid, 0)))
-            await ctx.send(f"⏳ Следующая рыбалка через **{rem}сек**.", delete_after=10); return
+        rem = FISH_CD.check_and_set(uid)
+        if rem:
+            await ctx.send(f"⏳ Следующая рыбалка через **{int(rem)}сек**.", delete_after=10); return
 
-        FISH_CD[uid] = now
         items, weights = zip(*((f[0], f[2]) for f in FISH_TABLE))
         catch  = random.choices(items, weights=weights, k=1)[0]
         reward = next(f[1] for f in FISH_TABLE if f[0] == catch)
@@ -0,0 +1,87 @@
+import discord
+from discord.ext import commands
+import time
+from data import MESSAGE_STATS, COMMAND_METRICS, METRICS_FILE, LOOP_MONITOR, DELETE_QUEUE, dump_metrics
+
+
+class StatsCog(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.command(name="msgstats", brief="[Админ] Статистика конвейера сообщений")
+    @commands.has_permissions(administrator=True)
+    async def msgstats(self, ctx):
+        DELETE_QUEUE.add(ctx.message)
+        s = MESSAGE_STATS
+        embed = discord.Embed(title="📨 Конвейер сообщений", color=discord.Color.dark_teal())
+        embed.add_field(name="Получено",         value=f"{s['messages']:,}")
+        embed.add_field(name="Разбор команд",    value=f"{s['dispatched']:,}")
+        embed.add_field(name="Вызвано команд",   value=f"{s['invoked']:,}")
+        embed.add_field(name="Повторные вызовы", value=f"{s['duplicates']:,}")
+        embed.set_footer(text="Повторных вызовов должно быть 0: каждое сообщение разбирается один раз")
+        await ctx.send(embed=embed)
+
+    @commands.command(
+        name="cmdstats",
+        brief="[Админ] Время выполнения команд",
+        help=(
+            "Перцентили времени команд, ошибки и доля API / записи данных.\n\n"
+            "**Использование:**\n"
+            "`!cmdstats` — 10 самых медленных команд по p99\n"
+            "`!cmdstats slow` — последние медленные вызовы\n"
+            "`!cmdstats dump` — сохранить полный отчёт в файл"
+        ),
+    )
+    @commands.has_permissions(administrator=True)
+    async def cmdstats(self, ctx, mode: str = "top"):
+        DELETE_QUEUE.add(ctx.message)
+        m = COMMAND_METRICS
+        if mode == "dump":
+            dump_metrics()
+            await ctx.send(f"💾 Отчёт сохранён в `{METRICS_FILE}`.", delete_after=10); return
+
+        if mode == "slow":
+            lines = [f"`{time.strftime('%H:%M:%S', time.localtime(e['t']))}` !{e['command']} — "
+                     f"**{e['ms']:.0f}** мс (API {e['api_ms']:.0f} / {e['api_calls']}, запись {e['persist_ms']:.0f})"
+                     for e in list(m.slow_log)[-15:]]
+            embed = discord.Embed(title=f"🐢 Медленные команды (≥ {m.slow_ms:.0f} мс)",
+                                  color=discord.Color.dark_teal(), description="\n".join(lines) or "—")
+            await ctx.send(embed=embed); return
+
+        lines = []
+        for name, s in m.top(10):
+            h = s.latency
+            lines.append(f"`!{name}` ×{h.count:,} — p50 **{h.percentile(50):.0f}** / p99 **{h.percentile(99):.0f}** "
+                         f"/ max {h.max:.0f} мс | API {s.api / h.count if h.count else 0:.0f} мс, "
+                         f"запись {s.persist / h.count if h.count else 0:.2f} мс | ошибок {s.errors}")
+        embed = discord.Embed(title="⏱️ Время команд", color=discord.Color.dark_teal(),
+                              description="\n".join(lines) or "—")
+        embed.add_field(name="HTTP к Discord", value=f"{m.api.count:,} запр., p99 {m.api.percentile(99):.0f} мс")
+        embed.add_field(name="Запись данных (фон)", value=f"{m.writes.count:,} раз, p99 {m.writes.percentile(99):.0f} мс")
+        embed.set_footer(text="Перцентили — по границам корзин гистограммы | !cmdstats slow | !cmdstats dump")
+        await ctx.send(embed=embed)
+
+
+    @commands.command(name="looplag", brief="[Админ] Задержки event loop и их причины")
+    @commands.has_permissions(administrator=True)
+    async def looplag(self, ctx):
+        DELETE_QUEUE.add(ctx.message)
+        w = LOOP_MONITOR
+        culprits, stalls = w.report()
+        embed = discord.Embed(title="🐌 Задержка event loop", color=discord.Color.dark_teal())
+        embed.add_field(name="Сейчас", value=f"{w.last_lag:.1f} мс")
+        embed.add_field(name="p50 / p99", value=f"{w.lag.percentile(50):.0f} / {w.lag.percentile(99):.0f} мс")
+        embed.add_field(name="Максимум", value=f"{w.lag.max:.0f} мс")
+        embed.add_field(name="Главные виновники",
+                        value="\n".join(f"`{name}` — {ms:,.0f} мс" for name, ms in culprits[:8]) or "—",
+                        inline=False)
+        embed.add_field(name="Последние зависания",
+                        value="\n".join(f"`{time.strftime('%H:%M:%S', time.localtime(e['t']))}` "
+                                        f"**{e['ms']:.0f}** мс — `{e['culprit']}`" for e in stalls[-8:]) or "—",
+                        inline=False)
+        embed.set_footer(text=f"Порог {w.threshold * 1000:.0f} мс | полные стеки — !cmdstats dump")
+        await ctx.send(embed=embed)
+
+
+def setup(bot):
+    bot.add_cog(StatsCog(bot))
@@ -7,7 +7,7 @@ import discord
 from discord.ext import commands
 import edge_tts
 from config import get_groq_client, AI_SYSTEM_PROMPT, TTS_SETTINGS
-from data import AUTO_CHANNELS, YOUR_USER_ID
+from data import AUTO_CHANNELS, YOUR_USER_ID, COMMAND_METRICS, DELETE_QUEUE
 
 AUDIO_FILE = os.path.abspath("greeting.mp3")
 _greeting_lock = asyncio.Lock()
@@ -32,7 +32,7 @@ class VoiceAICog(commands.Cog):
     # ── AI Chat ───────────────────────────────────────────────
     @commands.command(name="ask", aliases=["a", "спроси"], brief="Общий чат с AI (бот помнит всех)")
     async def ask_ai(self, ctx, *, question: str):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
 
         if not ctx.author.voice:
             await ctx.send("❌ Зайди в войс, чтобы я мог ответить голосом!", delete_after=5)
@@ -55,21 +55,23 @@ class VoiceAICog(commands.Cog):
 
         try:
             messages_for_api = [{"role": "system", "content": AI_SYSTEM_PROMPT}] + history
-            reply_obj = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: get_groq_client().chat.completions.create(
-                    model="llama-3.3-70b-versatile",
-                    max_tokens=400,
-                    messages=messages_for_api,
+            with COMMAND_METRICS.timed("groq"):
+                reply_obj = await asyncio.get_event_loop().run_in_executor(
+                    None,
+                    lambda: get_groq_client().chat.completions.create(
+                        model="llama-3.3-70b-versatile",
+                        max_tokens=400,
+                        messages=messages_for_api,
+                    )
                 )
-            )
             reply = reply_obj.choices[0].message.content.strip()
             history.append({"role": "assistant", "content": reply})
             await status_msg.edit(content=f"💬 **{ctx.author.display_name}**: {question}\n🤖 **AI**: {reply}")
 
             tts_path  = tempfile.mktemp(suffix=".mp3")
             communicate = edge_tts.Communicate(reply, TTS_SETTINGS["voice"])
-            await communicate.save(tts_path)
+            with COMMAND_METRICS.timed("tts"):
+                await communicate.save(tts_path)
 
             while vc.is_playing():
                 await asyncio.sleep(0.5)
@@ -85,7 +87,7 @@ class VoiceAICog(commands.Cog):
 
     @commands.command(name="join", aliases=["j"], brief="Позвать бота в голосовой канал")
     async def voice_join(self, ctx):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         if not ctx.author.voice:
             await ctx.send("❌ Сначала зайди в голосовой канал!", delete_after=5); return
         if ctx.guild.voice_client:
@@ -95,7 +97,7 @@ class VoiceAICog(commands.Cog):
 
     @commands.command(name="leave", aliases=["l", "выйти"], brief="Выгнать бота из войса")
     async def voice_leave(self, ctx):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         if ctx.guild.voice_client:
             await ctx.guild.voice_client.disconnect()
             await ctx.send("👋 Вышел из голосового канала.")
@@ -104,13 +106,13 @@ class VoiceAICog(commands.Cog):
 
     @commands.command(name="aiclear", brief="Очистить общую память чата")
     async def voice_clear(self, ctx):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         self._shared_histories[ctx.guild.id].clear()
         await ctx.send("🗑️ Общая память чата очищена. Бот всех забыл!")
 
     @commands.command(name="aivoice", brief="Сменить голос AI")
     async def voice_change(self, ctx, *, voice_name: str = None):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         if not voice_name:
             await ctx.send(
                 "🗣️ **Доступные голоса:**\n"
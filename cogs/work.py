@@ -1,26 +1,31 @@
 import random
-import asyncio
 import discord
 from discord.ext import commands
 from discord.ui import View, Button
 from discord import Interaction
 from data import (
-    player_funds, player_inventory, priemer_data,
-    SPORT_ITEMS_WITH_BRANDS, ORDERS, ORDER_MESSAGES, order_history,
-    save_funds, save_priemer,
+    player_funds, player_inventory, PRIEMER,
+    SPORT_ITEMS_WITH_BRANDS, ORDERS, ORDER_MESSAGES, DELETE_QUEUE,
+    save_funds,
 )
 from cogs.economy import init_player
+from catalogue import Catalogue
+from timers import TimerWheel
+from orders import Order
 
+CATALOGUE = Catalogue(SPORT_ITEMS_WITH_BRANDS)
 
-def generate_order():
-    n = random.randint(1, 30)
-    positions = []
-    for _ in range(n):
-        brand    = random.choice(list(SPORT_ITEMS_WITH_BRANDS.keys()))
-        item     = random.choice(SPORT_ITEMS_WITH_BRANDS[brand])
-        location = f"3{random.choice('BC')}{random.randint(1,56)}{random.choice('ABCDEFGHJ')}{random.randint(1,4)}"
-        positions.append({"location": location, "item": f"{brand} - {item}", "status": "не выполнено"})
-    return positions
+# Все таймеры пикинга (пауза между сканами, ожидание сапорта) — одна задача;
+# обратный отсчёт правит сообщение, только когда меняется видимое число.
+PICK_TIMERS = TimerWheel(tick=1.0, max_edits=10)
+
+
+def generate_order() -> Order:
+    return Order.from_positions(CATALOGUE.order())
+
+
+def generate_packing(size: int) -> Order:
+    return Order(CATALOGUE.item_names_sample(size))
 
 
 # ── PickingView ───────────────────────────────────────────────
@@ -51,53 +56,49 @@ class PickingView(View):
         await interaction.response.defer()
         self._picking = True
 
-        positions = [p for p in ORDERS[uid] if p["status"] == "не выполнено"]
-        if not positions:
+        order = ORDERS[uid]
+        if not order.remaining:
             self._picking = False
             await self._switch_to_finish(interaction); return
 
         if random.random() < 0.03:
             self.pick_btn.disabled = True
-            wait = random.randint(30, 180)
-            for r in range(wait, 0, -15):
-                try:
-                    await interaction.message.edit(
-                        content=f"{interaction.user.mention}, ошибка телефона — ждём сапорта. Ожидание: {r}с.", view=self)
+            wait    = random.randint(30, 180)
+            mention = interaction.user.mention
+            message = interaction.message
+
+            async def support_done():
+                self.pick_btn.disabled = False
+                self._picking = False
+                try: await message.edit(content=f"{mention}, продолжай пикинг.", view=self)
                 except Exception: pass
-                await asyncio.sleep(15)
-            self.pick_btn.disabled = False
-            self._picking = False
-            await interaction.message.edit(content=f"{interaction.user.mention}, продолжай пикинг.", view=self)
-            return
-
-        num = random.randint(1, 5)
-        picked = 0
-        for p in ORDERS[uid]:
-            if p["status"] == "не выполнено" and picked < num:
-                p["status"] = "выполнено"; picked += 1
 
-        done = [f"✅ ~~{i+1}. {p['location']} ({p['item']})~~"
-                for i, p in enumerate(ORDERS[uid]) if p["status"] == "выполнено"]
-        todo = [f"{i+1}. {p['location']} ({p['item']})"
-                for i, p in enumerate(ORDERS[uid]) if p["status"] == "не выполнено"]
-
-        content = f"{interaction.user.mention}\n" + "\n".join(done[-10:]) + "\n\n" + "\n".join(todo[:20])
-        if len(content) > 1950: content = content[:1950] + "..."
+            # число на экране меняется раз в 15 с: wait, wait-15, ...
+            PICK_TIMERS.schedule(
+                ("pick", uid), wait, support_done, message=message, view=self,
+                render=lambda left: f"{mention}, ошибка телефона — ждём сапорта. "
+                                    f"Ожидание: {wait - 15 * int((wait - left) // 15)}с.")
+            return
 
-        remaining = [p for p in ORDERS[uid] if p["status"] == "не выполнено"]
-        if not remaining:
+        order.pick(random.randint(1, 5))
+        if not order.remaining:
             self._picking = False
             await self._switch_to_finish(interaction)
         else:
-            delay = random.randint(1, 4)
+            content = f"{interaction.user.mention}\n" + order.progress_text()
+            if len(content) > 1950: content = content[:1950] + "..."
             self.pick_btn.disabled = True
             try: await interaction.message.edit(content=content, view=self)
             except Exception: pass
-            await asyncio.sleep(delay)
-            self.pick_btn.disabled = False
-            self._picking = False
-            try: await interaction.message.edit(view=self)
-            except Exception: pass
+            message = interaction.message
+
+            async def pick_ready():
+                self.pick_btn.disabled = False
+                self._picking = False
+                try: await message.edit(view=self)
+                except Exception: pass
+
+            PICK_TIMERS.schedule(("pick", uid), random.randint(1, 4), pick_ready)
 
     async def _switch_to_finish(self, interaction: Interaction):
         self.clear_items()
@@ -114,10 +115,7 @@ class PickingView(View):
         await interaction.response.defer()
         uid = self.user_id
         num = len(ORDERS.get(uid, []))
-        if uid not in order_history: order_history[uid] = []
-        order_history[uid].append(num)
-
-        pm = priemer_data.get(uid, 0)
+        pm  = PRIEMER.get(uid)
         if   pm < 60:  earnings = random.randint(50,    10_000)
         elif pm < 80:  earnings = random.randint(10_000, 20_000)
         elif pm < 120: earnings = random.randint(20_000, 50_000)
@@ -132,6 +130,7 @@ class PickingView(View):
 
         player_funds[uid] = player_funds.get(uid, 0) + net
         save_funds()
+        PRIEMER.add_order(uid, num)
         if uid in ORDERS:        del ORDERS[uid]
         if uid in ORDER_MESSAGES: del ORDER_MESSAGES[uid]
 
@@ -153,15 +152,11 @@ class PickingView(View):
             await interaction.response.send_message("Это не ваш заказ!", ephemeral=True); return
         await interaction.response.defer()
         uid = self.user_id
-        ORDERS[uid] = generate_order()
-        priemer_data[uid] = priemer_data.get(uid, 0)
-        save_priemer()
+        order = ORDERS[uid] = generate_order()
 
-        pickup = "\n".join(f"{i+1}. {o['location']} ({o['item']})" for i,o in enumerate(ORDERS[uid]))
-        if len(pickup) > 1800: pickup = pickup[:1800] + "..."
         nv  = PickingView(uid)
         msg = await interaction.channel.send(
-            f"{interaction.user.mention}, новый заказ **{len(ORDERS[uid])}** позиций. Приемер: **{priemer_data[uid]}**\n\n**Пикап лист:**\n{pickup}",
+            f"{interaction.user.mention}, новый заказ **{len(order)}** позиций. Приемер: **{PRIEMER.get(uid)}**\n\n**Пикап лист:**\n{order.pickup_list()}",
             view=nv)
         ORDER_MESSAGES[uid] = msg.id
         try: await interaction.message.delete()
@@ -171,17 +166,18 @@ class PickingView(View):
         if str(interaction.user.id) != self.user_id:
             await interaction.response.send_message("Это не ваш заказ!", ephemeral=True); return
         uid = self.user_id
+        PICK_TIMERS.cancel(("pick", uid))
         ORDERS.pop(uid, None); ORDER_MESSAGES.pop(uid, None)
         await interaction.message.edit(content=f"{interaction.user.mention}, вы вышли с работы.", view=None)
 
 
 # ── PackingView ───────────────────────────────────────────────
 class PackingView(View):
-    def __init__(self, user_id: str, order_size: int):
+    def __init__(self, user_id: str, order: Order):
         super().__init__(timeout=None)
         self.user_id      = str(user_id)
-        self.order_size   = order_size
-        self.remaining    = order_size
+        self.order        = order
+        self.order_size   = len(order)
         self.selected_box = None
 
         box_map = {"A":range(1,7),"B":range(7,13),"C":range(13,19),"D":range(19,25),"E":range(25,31)}
@@ -199,6 +195,10 @@ class PackingView(View):
         self.add_item(self.collect_btn)
         self.add_item(self.exit_btn)
 
+    @property
+    def remaining(self) -> int:
+        return self.order.remaining
+
     def _make_cb(self, box):
         async def cb(interaction: Interaction):
             await self._select_box(interaction, box)
@@ -220,7 +220,7 @@ class PackingView(View):
         if str(interaction.user.id) != self.user_id:
             await interaction.response.send_message("Это не ваш заказ!", ephemeral=True); return
         if self.remaining > 0:
-            self.remaining -= random.randint(1, min(5, self.remaining))
+            self.order.pick(random.randint(1, min(5, self.remaining)))
             if self.remaining > 0:
                 await interaction.message.edit(
                     content=f"{interaction.user.mention}, осталось: **{self.remaining}** товаров.", view=self)
@@ -245,10 +245,10 @@ class PackingView(View):
     async def _new_order(self, interaction: Interaction):
         if str(interaction.user.id) != self.user_id:
             await interaction.response.send_message("Это не ваш заказ!", ephemeral=True); return
-        ns  = random.randint(1, 30)
-        nv  = PackingView(self.user_id, ns)
+        order = ORDERS[self.user_id] = generate_packing(random.randint(1, 30))
+        nv    = PackingView(self.user_id, order)
         await interaction.message.edit(
-            content=f"{interaction.user.mention}, новый заказ: **{ns}** товаров. Выберите коробку.", view=nv)
+            content=f"{interaction.user.mention}, новый заказ: **{len(order)}** товаров. Выберите коробку.", view=nv)
 
     async def _exit(self, interaction: Interaction):
         if str(interaction.user.id) != self.user_id:
@@ -262,40 +262,34 @@ class PackingView(View):
 class WorkCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.bot.loop.create_task(self._update_priemer())
 
     @commands.command(name="gb", brief="Пойти работать на склад")
     async def start_job(self, ctx):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         await init_player(self.bot, ctx)
         uid = str(ctx.author.id)
         job = random.choice(["пикинг", "баление"])
 
         if job == "пикинг":
-            ORDERS[uid]       = generate_order()
-            priemer_data[uid] = priemer_data.get(uid, 0)
-            save_priemer()
-            pickup = "\n".join(f"{i+1}. {o['location']} ({o['item']})" for i,o in enumerate(ORDERS[uid]))
-            if len(pickup) > 1800: pickup = pickup[:1800] + "..."
-            view = PickingView(uid)
-            msg  = await ctx.send(
-                f"{ctx.author.mention} 📦 Работа: **пикинг** | Заказ: **{len(ORDERS[uid])}** позиций | Приемер: **{priemer_data[uid]}**\n\n**Пикап лист:**\n{pickup}",
+            order = ORDERS[uid] = generate_order()
+            view  = PickingView(uid)
+            msg   = await ctx.send(
+                f"{ctx.author.mention} 📦 Работа: **пикинг** | Заказ: **{len(order)}** позиций | Приемер: **{PRIEMER.get(uid)}**\n\n**Пикап лист:**\n{order.pickup_list()}",
                 view=view)
             ORDER_MESSAGES[uid] = msg.id
         else:
-            order_size = random.randint(1, 30)
-            ORDERS[uid] = [{"item": random.choice(random.choice(list(SPORT_ITEMS_WITH_BRANDS.values())))} for _ in range(order_size)]
-            view = PackingView(uid, order_size)
-            msg  = await ctx.send(
-                f"{ctx.author.mention} 📦 Работа: **баление** | Заказ: **{order_size}** товаров. Выберите коробку.",
+            order = ORDERS[uid] = generate_packing(random.randint(1, 30))
+            view  = PackingView(uid, order)
+            msg   = await ctx.send(
+                f"{ctx.author.mention} 📦 Работа: **баление** | Заказ: **{len(order)}** товаров. Выберите коробку.",
                 view=view)
             ORDER_MESSAGES[uid] = msg.id
 
     @commands.command(name="priemer", brief="Посмотреть показатель эффективности работы")
     async def priemer_cmd(self, ctx):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         uid = str(ctx.author.id)
-        pm  = priemer_data.get(uid, 0)
+        pm  = PRIEMER.get(uid)
         embed = discord.Embed(title=f"📦 Приемер {ctx.author.display_name}", color=discord.Color.orange())
         bar_fill = int((pm / 150) * 20)
         bar = "█" * bar_fill + "░" * (20 - bar_fill)
@@ -303,27 +297,15 @@ class WorkCog(commands.Cog):
         embed.add_field(name="Прогресс", value=f"`[{bar}]`")
         lv = "🔴 Низкий" if pm < 60 else ("🟡 Средний" if pm < 80 else ("🟢 Высокий" if pm < 120 else "💎 Максимум"))
         embed.add_field(name="Статус", value=lv)
+        for label, span, count, total in PRIEMER.stats(uid):
+            if count:
+                value = (f"Заказов: **{count}**\nПозиций: **{total}** (≈{total / count:.1f} на заказ)\n"
+                         f"Темп: **{count / (span / 3600):.1f}** заказов/ч")
+            else:
+                value = "Нет заказов"
+            embed.add_field(name=f"За {label}", value=value)
         await ctx.send(embed=embed)
 
-    async def _update_priemer(self):
-        await self.bot.wait_until_ready()
-        decay_counter = 0
-        while not self.bot.is_closed():
-            await asyncio.sleep(60)
-            decay_counter += 1
-            for uid in list(priemer_data.keys()):
-                orders = order_history.get(uid, [])
-                if orders:
-                    avg_o   = len(orders)
-                    avg_pos = sum(orders) / avg_o
-                    priemer_data[uid] = int(min(150, priemer_data[uid] + (avg_o * avg_pos) / 10))
-                elif decay_counter >= 60:
-                    priemer_data[uid] = int(max(0, priemer_data[uid] - 1))
-            if decay_counter >= 60:
-                decay_counter = 0
-            save_priemer()
-            order_history.clear()
-
 
 def setup(bot):
     bot.add_cog(WorkCog(bot))
@@ -1,21 +1,8 @@
-import time
 import random
 import discord
 from discord.ext import commands
-from data import player_xp, XP_CD, XP_PER_MESSAGE, save_xp
-
-
-def xp_for_level(lvl: int) -> int:
-    return int(100 * (lvl ** 1.5))
-
-
-def get_level(total_xp: int):
-    lvl = 1
-    xp  = total_xp
-    while xp >= xp_for_level(lvl):
-        xp -= xp_for_level(lvl)
-        lvl += 1
-    return lvl, xp
+from data import player_xp, XP_CD, XP_PER_MESSAGE, XP_RANK, save_xp, DELETE_QUEUE
+from levels import xp_for_level, get_level
 
 
 class XPCog(commands.Cog):
@@ -27,24 +14,20 @@ class XPCog(commands.Cog):
         if message.author.bot:
             return
         uid = str(message.author.id)
-        now = time.time()
-        if now - XP_CD.get(uid, 0) >= 60:
-            gain = random.randint(*XP_PER_MESSAGE)
+        if not XP_CD.check_and_set(uid):
+            gain   = random.randint(*XP_PER_MESSAGE)
             old_xp = player_xp.get(uid, 0)
             player_xp[uid] = old_xp + gain
-            XP_CD[uid] = now
-            save_xp()
-            old_lvl, _ = get_level(old_xp)
-            new_lvl, _ = get_level(player_xp[uid])
-            if new_lvl > old_lvl:
+            save_xp()   # только пометка: на диск XP уходит пачкой раз в XP_FLUSH_INTERVAL
+            lvl, cur = get_level(old_xp)
+            if cur + gain >= xp_for_level(lvl):
                 try:
                     await message.channel.send(
-                        f"🎉 {message.author.mention} достиг **{new_lvl} уровня**!",
+                        f"🎉 {message.author.mention} достиг **{get_level(old_xp + gain)[0]} уровня**!",
                         delete_after=10,
                     )
                 except Exception:
                     pass
-        await self.bot.process_commands(message)
 
     @commands.command(
         name="level",
@@ -60,7 +43,7 @@ class XPCog(commands.Cog):
         ),
     )
     async def show_level(self, ctx, member: discord.Member = None):
-        await ctx.message.delete()
+        DELETE_QUEUE.add(ctx.message)
         if member is None:
             member = ctx.author
         uid      = str(member.id)
@@ -76,6 +59,37 @@ class XPCog(commands.Cog):
         embed.add_field(name="📈 Прогресс", value=f"`[{bar}]` {cur}/{needed}",      inline=False)
         await ctx.send(embed=embed)
 
+    @commands.command(
+        name="rank",
+        brief="Место в рейтинге по XP",
+        help=(
+            "Показывает место игрока в общем рейтинге по XP и сколько XP "
+            "не хватает до игрока выше.\n\n"
+            "**Использование:**\n"
+            "`!rank` — твоё место\n"
+            "`!rank @user` — место другого игрока"
+        ),
+    )
+    async def show_rank(self, ctx, member: discord.Member = None):
+        DELETE_QUEUE.add(ctx.message)
+        if member is None:
+            member = ctx.author
+        uid  = str(member.id)
+        rank = XP_RANK.rank(uid)
+        if rank is None:
+            await ctx.send(f"{member.mention} ещё не в рейтинге — напиши пару сообщений!", delete_after=5); return
+        total  = XP_RANK.score(uid)
+        lvl, _ = get_level(total)
+        embed  = discord.Embed(title=f"🏅 Рейтинг {member.display_name}", color=discord.Color.purple())
+        embed.set_thumbnail(url=member.display_avatar.url)
+        embed.add_field(name="📍 Место",    value=f"{rank} из {len(XP_RANK)}", inline=True)
+        embed.add_field(name="⭐ Уровень",  value=str(lvl),                    inline=True)
+        embed.add_field(name="✨ Всего XP", value=f"{total:,}",                inline=True)
+        if rank > 1:
+            (_, above), = XP_RANK.top(1, rank - 2)
+            embed.add_field(name="⬆️ До места выше", value=f"{above - total + 1:,} XP", inline=False)
+        await ctx.send(embed=embed)
+
 
 def setup(bot):
     bot.add_cog(XPCog(bot))
@@ -0,0 +1 @@
+"""conftest.py — корень репозитория в sys.path для tests/ (модули лежат плоско)."""
@@ -0,0 +1,83 @@
+"""
+cooldowns.py — кулдауны команд с вытеснением истёкших записей.
+Старые ROB_CD/CRIME_CD/FISH_CD/XP_CD были dict-ами «uid → время», которые
+только росли. Cooldown хранит время окончания и раскладывает игроков по
+корзинам-слотам (колесо таймеров); номера слотов лежат в куче, поэтому
+истёкшие корзины выбрасываются целиком за амортизированное O(1) на запись.
+"""
+import heapq
+import time
+
+
+class Cooldown:
+    def __init__(self, seconds: float, granularity: float = 60, loader=None, on_change=None):
+        self.seconds     = seconds
+        self.granularity = granularity
+        self.on_change   = on_change    # вызывается после set() — для сохранения
+        self._loader     = loader       # -> {uid: until}, вызывается при первом обращении
+        self._until      = {}           # uid -> время окончания кулдауна
+        self._buckets    = {}           # слот -> set(uid)
+        self._slots      = []           # куча номеров слотов
+
+    def _ensure_loaded(self):
+        if self._loader is not None:
+            loader, self._loader = self._loader, None
+            now = time.time()
+            for uid, until in loader().items():
+                if until > now:
+                    self._put(uid, until)
+
+    def _put(self, uid, until):
+        self._until[uid] = until
+        slot   = int(until // self.granularity)
+        bucket = self._buckets.get(slot)
+        if bucket is None:
+            bucket = self._buckets[slot] = set()
+            heapq.heappush(self._slots, slot)
+        bucket.add(uid)
+
+    def _evict(self, now):
+        current = int(now // self.granularity)
+        while self._slots and self._slots[0] < current:
+            for uid in self._buckets.pop(heapq.heappop(self._slots)):
+                # игрок мог получить новый кулдаун в более позднем слоте
+                if self._until.get(uid, now) <= now:
+                    self._until.pop(uid, None)
+
+    # ── API ───────────────────────────────────────────────────
+    def remaining(self, uid, now: float = None) -> float:
+        """Сколько секунд осталось; 0 — можно."""
+        self._ensure_loaded()
+        if now is None:
+            now = time.time()
+        until = self._until.get(uid)
+        return 0 if until is None or until <= now else until - now
+
+    def set(self, uid, now: float = None):
+        self._ensure_loaded()
+        if now is None:
+            now = time.time()
+        self._evict(now)
+        self._put(uid, now + self.seconds)
+        if self.on_change:
+            self.on_change()
+
+    def check_and_set(self, uid, now: float = None) -> float:
+        """0 и запуск кулдауна, если можно; иначе — сколько секунд ждать."""
+        if now is None:
+            now = time.time()
+        rem = self.remaining(uid, now)
+        if rem > 0:
+            return rem
+        self.set(uid, now)
+        return 0
+
+    def dump(self) -> dict:
+        self._ensure_loaded()
+        now = time.time()
+        self._evict(now)
+        return {uid: until for uid, until in self._until.items() if until > now}
+
+    def __len__(self):
+        self._ensure_loaded()
+        return len(self._until)
@@ -2,8 +2,19 @@
 data.py — все глобальные данные, константы, save/load функции.
 Импортируется во все cog-модули.
 """
-import json
+import asyncio
+import atexit
+import os
 import time
+from storage import load_json, save_json, bind_loop, LazyJSON
+from cooldowns import Cooldown
+from ranking import RankIndex
+from names import NameCache
+from transactions import Ledger
+from metrics import CommandMetrics, Histogram
+from loop_monitor import LoopWatchdog
+from outbox import Outbox, DeleteQueue
+from priemer import Priemer
 
 # ── File paths ────────────────────────────────────────────────
 FUNDS_FILE      = "player_funds.json"
@@ -17,49 +28,259 @@ DAILY_FILE      = "player_daily.json"
 BANK_FILE       = "player_bank.json"
 SERVER_EFF_FILE = "server_effects.json"
 WARNS_FILE      = "player_warns.json"
+JOURNAL_FILE    = "money_journal.jsonl"
+COOLDOWNS_FILE  = "cooldowns.json"
+METRICS_FILE    = "command_metrics.json"
+PRIEMER_TS_FILE = "priemer_state.json"
 
 
-# ── JSON helpers ──────────────────────────────────────────────
-def load_json(path, default=None):
-    if default is None:
-        default = {}
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return default if not isinstance(default, type) else default()
+# ── Storage backend ───────────────────────────────────────────
+# json   — файл читается при первом обращении к коллекции (не при импорте);
+#          данные игроков собраны в PlayerRecord (players.py), player_* —
+#          представления его полей. warm_up() загружает всё разом.
+# sqlite — одна БД в режиме WAL, строки читаются по требованию и пишутся
+#          построчно. При первом запуске таблицы наполняются из JSON-файлов.
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "json")
+DB_FILE         = os.getenv("DB_FILE", "bazarcik.db")
+
+if STORAGE_BACKEND == "sqlite":
+    from sqlite_store import connect, SQLiteCollection
+    _db = connect(DB_FILE)
+
+    def _open(path):
+        return SQLiteCollection(_db, path.removesuffix(".json"), path)
+
+    def _open_player(field, path):
+        return _open(path)
+else:
+    from players import PlayerStore
+    PLAYERS = PlayerStore()
 
+    def _open(path):
+        return LazyJSON(path)
 
-def save_json(path, data):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    def _open_player(field, path):
+        return PLAYERS.view(field, lambda view: view.load(load_json(path)))
 
 
 # ── Player data ───────────────────────────────────────────────
-player_funds      = load_json(FUNDS_FILE)
-player_loans      = load_json(LOANS_FILE)
-player_businesses = load_json(BUSINESS_FILE)
-priemer_data      = load_json(PRIEMER_FILE)
-player_xp         = load_json(XP_FILE)
-player_inventory  = load_json(INVENTORY_FILE)
-player_daily      = load_json(DAILY_FILE)
-player_bank       = load_json(BANK_FILE)
-server_effects    = load_json(SERVER_EFF_FILE)
-player_warns      = load_json(WARNS_FILE)
-USER_ORDERS_COMPLETED = load_json(ORDERS_FILE)
+player_funds      = _open_player("funds",      FUNDS_FILE)
+player_loans      = _open_player("loans",      LOANS_FILE)
+player_businesses = _open_player("businesses", BUSINESS_FILE)
+priemer_data      = _open_player("priemer",    PRIEMER_FILE)
+player_xp         = _open_player("xp",         XP_FILE)
+player_inventory  = _open_player("inventory",  INVENTORY_FILE)
+player_daily      = _open_player("daily",      DAILY_FILE)
+player_bank       = _open_player("bank",       BANK_FILE)
+player_warns      = _open_player("warns",      WARNS_FILE)
+server_effects    = _open(SERVER_EFF_FILE)
+USER_ORDERS_COMPLETED = _open(ORDERS_FILE)
+
+
+def get_player(uid):
+    """Все данные игрока одним поиском: PlayerRecord (поля — MISSING, если не заданы)."""
+    if STORAGE_BACKEND != "sqlite":
+        return PLAYERS.get(uid)
+    from players import PlayerRecord
+    rec, key = PlayerRecord(), str(uid)
+    for field, coll in (("funds", player_funds), ("bank", player_bank), ("xp", player_xp),
+                        ("daily", player_daily), ("inventory", player_inventory),
+                        ("priemer", priemer_data), ("warns", player_warns),
+                        ("loans", player_loans), ("businesses", player_businesses)):
+        if key in coll:
+            setattr(rec, field, coll[key])
+    return rec
+
+
+# ── Money journal ─────────────────────────────────────────────
+# С JSON-бэкендом каждое изменение player_funds / player_bank — строка в
+# append-only журнале, а не перезапись файла. Снапшоты JSON переписываются
+# только при компакции — раз в JOURNAL_COMPACT_EVERY записей; журнал
+# проигрывается при загрузке коллекции. SQLite и так пишет построчно — там
+# журнал не нужен.
+JOURNAL_COMPACT_EVERY = int(os.getenv("JOURNAL_COMPACT_EVERY", "5000"))
+money_journal = None
+
+if STORAGE_BACKEND != "sqlite":
+    from journal import Journal
+    money_journal = Journal(JOURNAL_FILE)
+
+    def _money_loader(name, path):
+        def load(view):
+            view.load(load_json(path))
+            money_journal.replay({name: view})
+        return load
+
+    player_funds.set_loader(_money_loader("funds", FUNDS_FILE))
+    player_bank.set_loader(_money_loader("bank", BANK_FILE))
+    player_funds.listeners.append(money_journal.listener("funds"))
+    player_bank.listeners.append(money_journal.listener("bank"))
+
+
+
+# ── Rankings ──────────────────────────────────────────────────
+# Богатство = наличные + банк. Индекс строится при первом запросе и дальше
+# обновляется слушателями player_funds / player_bank на каждое изменение.
+def _wealth(uid):
+    return player_funds.get(uid, 0) + player_bank.get(uid, 0)
+
+WEALTH_RANK = RankIndex(lambda: ((uid, _wealth(uid)) for uid in set(player_funds) | set(player_bank)))
+
+def _on_wealth_change(key, old, new):
+    WEALTH_RANK.update(key, _wealth(key))
+
+player_funds.listeners.append(_on_wealth_change)
+player_bank.listeners.append(_on_wealth_change)
+
+# Рейтинг по XP для !toplevel и !rank — так же, от слушателя player_xp.
+XP_RANK = RankIndex(lambda: player_xp.items())
+
+def _on_xp_change(key, old, new):
+    if key in player_xp:
+        XP_RANK.update(key, new)
+    else:
+        XP_RANK.remove(key)
+
+player_xp.listeners.append(_on_xp_change)
+
+def warm_up():
+    """Загрузить все коллекции сразу (например, в on_ready), а не по первому обращению."""
+    for coll in (player_funds, player_loans, player_businesses, priemer_data, player_xp,
+                 player_inventory, player_daily, player_bank, player_warns,
+                 server_effects, USER_ORDERS_COMPLETED):
+        if hasattr(coll, "ensure_loaded"):
+            coll.ensure_loaded()
+
+
+# ── Write-behind ──────────────────────────────────────────────
+# save_*() только помечает коллекцию «грязной». В запись её отдаёт flush_dirty():
+# фоновый flush_loop раз в SAVE_INTERVAL секунд и atexit при выходе, так что
+# серия save_funds() от спама командами превращается в одну запись файла.
+# SAVE_INTERVAL=0 возвращает старое поведение (запись сразу).
+# Для «шумных» коллекций свой, более редкий интервал: XP меняется почти на каждое
+# сообщение, поэтому прирост копится в памяти и пишется раз в XP_FLUSH_INTERVAL.
+SAVE_INTERVAL     = float(os.getenv("SAVE_INTERVAL", "5"))
+XP_FLUSH_INTERVAL = float(os.getenv("XP_FLUSH_INTERVAL", "60"))
+
+_COLLECTIONS: dict = {
+    FUNDS_FILE:      player_funds,
+    LOANS_FILE:      player_loans,
+    BUSINESS_FILE:   player_businesses,
+    PRIEMER_FILE:    priemer_data,
+    XP_FILE:         player_xp,
+    INVENTORY_FILE:  player_inventory,
+    DAILY_FILE:      player_daily,
+    BANK_FILE:       player_bank,
+    SERVER_EFF_FILE: server_effects,
+    WARNS_FILE:      player_warns,
+    COOLDOWNS_FILE:  lambda: {name: cd.dump() for name, cd in _PERSISTED_CDS.items()},
+    PRIEMER_TS_FILE: lambda: PRIEMER.dump(),
+}
+_FLUSH_EVERY: dict = {XP_FILE: XP_FLUSH_INTERVAL}
+_last_write:  dict = {}
+_dirty: set = set()
+
+
+def _write(path):
+    t0 = time.perf_counter()
+    try:
+        _write_collection(path)
+    finally:
+        COMMAND_METRICS.add_write((time.perf_counter() - t0) * 1000)
+
+
+def _write_failed(path):
+    # вызывается в event loop (storage.bind_loop), когда поток-писатель не смог
+    # записать коллекцию: она снова «грязная» и уйдёт в следующий flush_dirty()
+    def on_error(exc):
+        _dirty.add(path)
+        COMMAND_METRICS.add_write_error()
+    return on_error
+
+
+def _write_collection(path):
+    if money_journal is not None and path in (FUNDS_FILE, BANK_FILE):
+        money_journal.flush(on_error=_write_failed(path))
+        if money_journal.size >= JOURNAL_COMPACT_EVERY:
+            money_journal.compact({FUNDS_FILE: player_funds, BANK_FILE: player_bank},
+                                  on_error=_write_failed(path))
+        return
+    coll = _COLLECTIONS[path]
+    if callable(coll):
+        coll = coll()
+    if hasattr(coll, "commit"):
+        coll.commit(on_error=_write_failed(path))
+    else:
+        save_json(path, coll, on_error=_write_failed(path))
+
+
+def mark_dirty(path):
+    # команде засчитывается то, что она ждёт сама: пометку или, при
+    # SAVE_INTERVAL=0, синхронную запись; фоновый flush_loop — в COMMAND_METRICS.writes
+    t0 = time.perf_counter()
+    if SAVE_INTERVAL <= 0:
+        _write(path)
+    else:
+        _dirty.add(path)
+    COMMAND_METRICS.add_persist((time.perf_counter() - t0) * 1000)
+
+
+FLUSH_TIMES = Histogram()   # длительность flush_dirty() с хотя бы одной записью, мс
+
+
+def flush_dirty(force: bool = True):
+    # Снапшот снимается здесь, кодирование и запись — в потоке storage.
+    # force=False (фоновый цикл) пропускает коллекции, чей интервал ещё не прошёл.
+    now     = time.monotonic()
+    written = 0
+    for path in list(_dirty):
+        if not force and now - _last_write.get(path, float("-inf")) < _FLUSH_EVERY.get(path, 0):
+            continue
+        _dirty.discard(path)
+        _last_write[path] = now
+        _write(path)
+        written += 1
+    if written:
+        FLUSH_TIMES.observe((time.monotonic() - now) * 1000)
+
+
+async def flush_loop(bot):
+    bind_loop(asyncio.get_running_loop())
+    while not bot.is_closed():
+        await asyncio.sleep(SAVE_INTERVAL)
+        flush_dirty(force=False)
+
+
+atexit.register(flush_dirty)
 
 
 # ── Save functions ────────────────────────────────────────────
-def save_funds():       save_json(FUNDS_FILE,      player_funds)
-def save_loans():       save_json(LOANS_FILE,      player_loans)
-def save_businesses():  save_json(BUSINESS_FILE,   player_businesses)
-def save_priemer():     save_json(PRIEMER_FILE,     priemer_data)
-def save_xp():          save_json(XP_FILE,          player_xp)
-def save_inventory():   save_json(INVENTORY_FILE,  player_inventory)
-def save_daily():       save_json(DAILY_FILE,       player_daily)
-def save_bank():        save_json(BANK_FILE,        player_bank)
-def save_server_eff():  save_json(SERVER_EFF_FILE,  server_effects)
-def save_warns():       save_json(WARNS_FILE,       player_warns)
+def save_funds():       mark_dirty(FUNDS_FILE)
+def save_loans():       mark_dirty(LOANS_FILE)
+def save_businesses():  mark_dirty(BUSINESS_FILE)
+def save_priemer():     mark_dirty(PRIEMER_FILE)
+def save_xp():          mark_dirty(XP_FILE)
+def save_inventory():   mark_dirty(INVENTORY_FILE)
+def save_daily():       mark_dirty(DAILY_FILE)
+def save_bank():        mark_dirty(BANK_FILE)
+def save_server_eff():  mark_dirty(SERVER_EFF_FILE)
+def save_warns():       mark_dirty(WARNS_FILE)
+def save_cooldowns():   mark_dirty(COOLDOWNS_FILE)
+def save_priemer_ts():  save_priemer(); mark_dirty(PRIEMER_TS_FILE)
+
+
+# ── Transactions ──────────────────────────────────────────────
+# Денежные операции с несколькими счетами — через LEDGER.transaction(...)
+LEDGER = Ledger({"funds": player_funds, "bank": player_bank},
+                {"funds": save_funds,   "bank": save_bank})
+
+
+# ── Priemer ───────────────────────────────────────────────────
+# Прирост — при завершении заказа, падение за простой (-1 в час) — лениво
+# при чтении PRIEMER.get(). Время активности переживает перезапуск.
+PRIEMER = Priemer(priemer_data,
+                  loader=lambda: load_json(PRIEMER_TS_FILE),
+                  on_change=save_priemer_ts)
 
 
 # ── Mafia state ───────────────────────────────────────────────
@@ -74,18 +295,53 @@ MAFIA_DATA: dict = {
     "guild_id":    None,
 }
 
-# ── In-memory cooldowns & state ───────────────────────────────
-ROB_CD:   dict = {}
-CRIME_CD: dict = {}
-FISH_CD:  dict = {}
-XP_CD:    dict = {}
+# ── Cooldowns ─────────────────────────────────────────────────
+# Истёкшие записи вытесняются (cooldowns.py). rob/crime/fish переживают
+# перезапуск через COOLDOWNS_FILE; XP-кулдаун короткий и хранится только в памяти.
+def _persisted_cd(name, seconds):
+    return Cooldown(seconds,
+                    loader=lambda: load_json(COOLDOWNS_FILE).get(name, {}),
+                    on_change=save_cooldowns)
+
+ROB_CD   = _persisted_cd("rob",   3600)
+CRIME_CD = _persisted_cd("crime", 1800)
+FISH_CD  = _persisted_cd("fish",  300)
+XP_CD    = Cooldown(60)
+
+_PERSISTED_CDS: dict = {"rob": ROB_CD, "crime": CRIME_CD, "fish": FISH_CD}
+
+# ── In-memory state ───────────────────────────────────────────
+
+# Конвейер сообщений (main.on_message): сколько пришло, сколько ушло в
+# разбор команд и сколько команд вызвано; duplicates > 0 — двойной вызов.
+MESSAGE_STATS: dict = {"messages": 0, "dispatched": 0, "invoked": 0, "duplicates": 0}
+
+# Время команд (main.py: before/after_invoke), отчёт — !cmdstats.
+# Команды дольше SLOW_COMMAND_MS попадают в журнал медленных вызовов.
+COMMAND_METRICS = CommandMetrics(slow_ms=float(os.getenv("SLOW_COMMAND_MS", "1000")))
+
+# Задержка event loop и виновные вызовы (loop_monitor.py), отчёт — !looplag.
+# LOOP_LAG_MS=0 отключает наблюдение.
+LOOP_LAG_MS  = float(os.getenv("LOOP_LAG_MS", "250"))
+LOOP_MONITOR = LoopWatchdog(threshold_ms=LOOP_LAG_MS or 250)
+
+def dump_metrics():
+    save_json(METRICS_FILE, {**COMMAND_METRICS.to_dict(), "loop": LOOP_MONITOR.to_dict()})
+
+# Исходящие сообщения, которые можно склеить (outbox.py)
+OUTBOX = Outbox()
+
+# Удаление сообщений с командами в фоне, пачками (вместо await ctx.message.delete())
+DELETE_QUEUE = DeleteQueue()
+
+# Имена участников для !top / !toplevel (TTL 10 минут)
+NAME_CACHE = NameCache(ttl=600)
 
 LOTTO_POOL:    dict = {}
 LOTTO_RUNNING: dict = {}
 
 ORDERS:         dict = {}
 ORDER_MESSAGES: dict = {}
-order_history:  dict = {}
 
 # ── Economy constants ─────────────────────────────────────────
 TAX_THRESHOLD = 20_000
@@ -0,0 +1,141 @@
+"""
+exporter.py — метрики в текстовом формате Prometheus на локальном порту.
+Включается переменной METRICS_PORT (по умолчанию выключено); адрес —
+METRICS_HOST, по умолчанию 127.0.0.1. Сервер — asyncio.start_server в том же
+event loop, без сторонних библиотек: на GET /metrics отдаётся снимок
+счётчиков команд, гистограмм времени, задержки loop и размеров состояния.
+"""
+import asyncio
+import math
+from metrics import BUCKETS_MS
+from data import (
+    MESSAGE_STATS, COMMAND_METRICS, LOOP_MONITOR, FLUSH_TIMES, MAFIA_DATA,
+    ORDERS, ORDER_MESSAGES, PRIEMER, LOTTO_POOL, NAME_CACHE,
+    ROB_CD, CRIME_CD, FISH_CD, XP_CD, STORAGE_BACKEND, OUTBOX, DELETE_QUEUE, _dirty, money_journal,
+)
+
+PREFIX = "bazarcik_"
+
+
+def _label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Writer:
+    def __init__(self):
+        self.lines = []
+        self._seen = set()
+
+    def _header(self, name, kind, help_text):
+        if name not in self._seen:
+            self._seen.add(name)
+            self.lines.append(f"# HELP {PREFIX}{name} {help_text}")
+            self.lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+    @staticmethod
+    def _labels(labels: dict) -> str:
+        if not labels:
+            return ""
+        return "{" + ",".join(f'{k}="{_label(v)}"' for k, v in labels.items()) + "}"
+
+    def sample(self, name, kind, help_text, value, **labels):
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return
+        self._header(name, kind, help_text)
+        self.lines.append(f"{PREFIX}{name}{self._labels(labels)} {value}")
+
+    def histogram(self, name, help_text, hist, **labels):
+        """Histogram из metrics.py (мс) → гистограмма Prometheus в секундах."""
+        self._header(name, "histogram", help_text)
+        cumulative = 0
+        for bound, n in zip(BUCKETS_MS, hist.counts):
+            cumulative += n
+            le = "+Inf" if bound == float("inf") else repr(bound / 1000)
+            self.lines.append(f"{PREFIX}{name}_bucket{self._labels({**labels, 'le': le})} {cumulative}")
+        self.lines.append(f"{PREFIX}{name}_sum{self._labels(labels)} {hist.total / 1000}")
+        self.lines.append(f"{PREFIX}{name}_count{self._labels(labels)} {hist.count}")
+
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def collect(bot) -> str:
+    w = _Writer()
+    for kind, n in MESSAGE_STATS.items():
+        w.sample("messages_total", "counter", "Сообщения и вызовы команд по этапам конвейера", n, stage=kind)
+
+    for name, s in COMMAND_METRICS.commands.items():
+        w.histogram("command_duration_seconds", "Время выполнения команды", s.latency, command=name)
+        w.sample("command_errors_total", "counter", "Ошибки команд", s.errors, command=name)
+        w.sample("command_api_seconds_total", "counter", "Время HTTP-запросов к Discord внутри команды",
+                 s.api / 1000, command=name)
+        w.sample("command_persist_seconds_total", "counter", "Время сохранения, которое ждала команда (mark_dirty)",
+                 s.persist / 1000, command=name)
+    w.histogram("discord_http_duration_seconds", "HTTP-запросы к Discord", COMMAND_METRICS.api)
+    for service, hist in COMMAND_METRICS.external.items():
+        w.histogram("external_duration_seconds", "Вызовы внешних сервисов (Groq, TTS)", hist, service=service)
+
+    w.histogram("persist_write_duration_seconds", "Одна запись коллекции (data._write), в основном фоновая",
+                COMMAND_METRICS.writes)
+    w.sample("persist_write_errors_total", "counter", "Записи, не удавшиеся в потоке storage (уйдут на повтор)",
+             COMMAND_METRICS.write_errors)
+    w.histogram("flush_duration_seconds", "Цикл flush_dirty() с записью", FLUSH_TIMES)
+    w.sample("dirty_collections", "gauge", "Коллекции, ждущие записи", len(_dirty))
+    if money_journal is not None:
+        w.sample("journal_records", "gauge", "Записей в журнале денег с последней компакции", money_journal.size)
+
+    latency = getattr(bot, "latency", None)
+    if latency is not None and math.isfinite(latency):
+        w.sample("gateway_latency_seconds", "gauge", "Задержка heartbeat шлюза Discord", latency)
+    w.histogram("loop_lag_seconds", "Задержка пробуждения задачи в event loop", LOOP_MONITOR.lag)
+    w.sample("loop_lag_last_seconds", "gauge", "Последняя измеренная задержка event loop",
+             LOOP_MONITOR.last_lag / 1000)
+    culprits, _ = LOOP_MONITOR.report()
+    for culprit, ms in culprits:
+        w.sample("loop_stall_seconds_total", "counter", "Время зависаний event loop по виновнику",
+                 ms / 1000, culprit=culprit)
+
+    for kind, n in OUTBOX.stats.items():
+        w.sample("outbox_messages_total", "counter", "Очередь исходящих: поставлено / отправлено / склеено / ошибок",
+                 n, kind=kind)
+    w.sample("outbox_pending", "gauge", "Сообщения, ждущие отправки", len(OUTBOX))
+    for kind, n in DELETE_QUEUE.stats.items():
+        w.sample("delete_queue_total", "counter", "Фоновое удаление сообщений с командами", n, kind=kind)
+    w.sample("delete_queue_pending", "gauge", "Сообщения, ждущие удаления", len(DELETE_QUEUE))
+
+    w.sample("orders_active", "gauge", "Активные заказы на складе", len(ORDERS))
+    w.sample("mafia_games_active", "gauge", "Идущие игры в мафию", int(bool(MAFIA_DATA["is_running"])))
+    sizes = {
+        "ORDERS": ORDERS, "ORDER_MESSAGES": ORDER_MESSAGES, "PRIEMER": PRIEMER,
+        "LOTTO_POOL": LOTTO_POOL, "NAME_CACHE": NAME_CACHE, "ROB_CD": ROB_CD, "CRIME_CD": CRIME_CD,
+        "FISH_CD": FISH_CD, "XP_CD": XP_CD, "mafia_players": MAFIA_DATA["players"],
+    }
+    for name, obj in sizes.items():
+        w.sample("state_size", "gauge", "Размер структур состояния в памяти", len(obj), structure=name)
+    w.sample("info", "gauge", "Сведения об экземпляре", 1, backend=STORAGE_BACKEND)
+    return w.text()
+
+
+async def start_exporter(bot, port: int, host: str = "127.0.0.1"):
+    async def handle(reader, writer):
+        try:
+            request = await asyncio.wait_for(reader.readline(), 5)
+            while (await asyncio.wait_for(reader.readline(), 5)) not in (b"\r\n", b"\n", b""):
+                pass   # заголовки не нужны
+            parts = request.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+                body, status = collect(bot).encode("utf-8"), "200 OK"
+                ctype = "text/plain; version=0.0.4; charset=utf-8"
+            else:
+                body, status, ctype = b"not found\n", "404 Not Found", "text/plain"
+            writer.write(f"HTTP/1.1 {status}\r\nContent-Type: {ctype}\r\n"
+                         f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+            await writer.drain()
+        except Exception as e:
+            print(f"[METRICS] Ошибка запроса: {e}")
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    print(f"📈 Метрики: http://{host}:{port}/metrics")
+    return server
@@ -0,0 +1,114 @@
+"""
+journal.py — append-only журнал денежных операций.
+Каждое изменение баланса — одна JSON-строка {"t", "c", "u", "d", "v"}:
+время, коллекция, игрок, дельта и новый баланс. Записи копятся в памяти и
+дописываются пачкой с одним fsync в потоке storage. При старте журнал
+проигрывается поверх последнего снапшота; так как "v" — абсолютное значение,
+повторное проигрывание уже учтённых записей ничего не ломает.
+"""
+import json
+import os
+import time
+from players import MISSING
+from storage import snapshot, submit, _write_json
+
+
+class Journal:
+    def __init__(self, path: str):
+        self.path      = path
+        self.old_path  = f"{path}.old"
+        self.size      = 0       # записей с последней компакции
+        self._buffer   = []
+
+    def record(self, coll: str, uid, old, new):
+        try:
+            delta = new - old
+        except TypeError:
+            delta = None
+        self._buffer.append({"t": round(time.time(), 3), "c": coll, "u": uid, "d": delta, "v": new})
+        self.size += 1
+
+    def listener(self, coll: str):
+        """Callback для FieldView.listeners: журналирует изменения поля coll."""
+        def on_change(key, old, new):
+            self.record(coll, key, 0 if old is MISSING else old, None if new is MISSING else new)
+        return on_change
+
+    def flush(self, on_error=None):
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+
+        def failed(exc):
+            # пачка возвращается в начало буфера и уйдёт со следующим flush();
+            # строки, успевшие попасть в файл, при проигрывании повторятся без вреда
+            self._buffer[:0] = batch
+            if on_error is not None:
+                on_error(exc)
+        submit(lambda: self._append(batch), on_error=failed)
+
+    def _append(self, batch):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in batch))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def compact(self, snapshots: dict, on_error=None):
+        """
+        Ротация журнала → запись снапшотов → удаление старого журнала — одной
+        задачей storage. .old удаляется, только когда все снапшоты заменены на
+        диске; если запись не удалась, .old остаётся и проигрывается при старте.
+        """
+        for data in snapshots.values():
+            # ленивая коллекция должна проиграть журнал до его ротации
+            if hasattr(data, "ensure_loaded"):
+                data.ensure_loaded()
+        self.flush(on_error)
+        self.size = 0
+        frozen    = {path: snapshot(data) for path, data in snapshots.items()}
+        submit(lambda: self._compact(frozen), on_error=on_error)
+
+    def _compact(self, snapshots: dict):
+        self._rotate()
+        for path, data in snapshots.items():
+            _write_json(path, data)   # исключение — .old не трогаем
+        if os.path.exists(self.old_path):
+            os.remove(self.old_path)
+
+    def _rotate(self):
+        if not os.path.exists(self.path):
+            return
+        if not os.path.exists(self.old_path):
+            os.replace(self.path, self.old_path)
+            return
+        # прошлая компакция не дописала снапшоты — её .old ещё нужен, дописываем в него
+        with open(self.path, "r", encoding="utf-8") as src, open(self.old_path, "a", encoding="utf-8") as dst:
+            dst.write(src.read())
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.remove(self.path)
+
+    def replay(self, collections: dict) -> int:
+        applied = 0
+        for path in (self.old_path, self.path):
+            try:
+                f = open(path, "r", encoding="utf-8")
+            except FileNotFoundError:
+                continue
+            with f:
+                for line in f:
+                    try:
+                        r = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue   # оборванная последняя строка после сбоя
+                    coll = collections.get(r.get("c"))
+                    if coll is None:
+                        continue
+                    if r["v"] is None:
+                        coll.pop_raw(r["u"])
+                    else:
+                        coll.set_raw(r["u"], r["v"])
+                    applied += 1
+        self.size += applied
+        return applied
+
@@ -0,0 +1,32 @@
+"""
+levels.py — формула уровней XP.
+Накопительная таблица порогов строится один раз и растёт по мере надобности,
+get_level — бинарный поиск по ней вместо цикла по уровням.
+"""
+from bisect import bisect_right
+
+
+def xp_for_level(lvl: int) -> int:
+    return int(100 * (lvl ** 1.5))
+
+
+# _CUMULATIVE[k] — сколько всего XP нужно, чтобы дойти до уровня k + 1
+_CUMULATIVE = [0]
+
+
+def _extend_to(total_xp: int):
+    while _CUMULATIVE[-1] <= total_xp:
+        _CUMULATIVE.append(_CUMULATIVE[-1] + xp_for_level(len(_CUMULATIVE)))
+
+
+def get_level(total_xp: int):
+    """(уровень, XP сверх начала уровня) за O(log L)."""
+    if total_xp < 0:
+        return 1, total_xp
+    if _CUMULATIVE[-1] <= total_xp:
+        _extend_to(total_xp)
+    lvl = bisect_right(_CUMULATIVE, total_xp)
+    return lvl, total_xp - _CUMULATIVE[lvl - 1]
+
+
+_extend_to(1_000_000)
@@ -0,0 +1,128 @@
+"""
+loop_monitor.py — задержка event loop и кто в ней виноват.
+Задача в loop раз в interval отмечает «пульс» и измеряет, насколько позже
+запланированного она проснулась. Отдельный поток следит за пульсом: пока
+его нет дольше threshold, он снимает стек потока event loop
+(sys._current_frames) — это и есть блокирующий вызов. Когда loop
+оживает, самый частый кадр из кода бота (например data.save_json или
+cogs.xp.get_level) попадает в скользящий отчёт вместе со стеком.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from metrics import Histogram
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def _frame_label(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}.{frame.f_code.co_name}"
+
+
+class LoopWatchdog:
+    def __init__(self, threshold_ms: float = 250, interval: float = 0.1, report_size: int = 50):
+        self.threshold = threshold_ms / 1000
+        self.interval  = interval
+        self.lag       = Histogram()                 # задержка пробуждения пульса, мс
+        self.last_lag  = 0.0
+        self.stalls    = deque(maxlen=report_size)   # последние зависания
+        self.culprits  = Counter()                   # кадр -> суммарно мс зависаний
+        self._beat     = time.monotonic()
+        self._loop_tid = None
+        self._samples  = []                          # (виновник, строки стека) текущего зависания
+        self._lock     = threading.Lock()            # stalls/culprits пишет поток, читает loop
+        self._thread   = None
+        self._task     = None
+
+    def start(self):
+        """Вызывать из работающего event loop."""
+        if self._task is not None:
+            return
+        self._loop_tid = threading.get_ident()
+        self._beat     = time.monotonic()
+        self._task     = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread   = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def _heartbeat(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now           = time.monotonic()
+            self.last_lag = max(0.0, now - expected) * 1000
+            self.lag.observe(self.last_lag)
+            self._beat    = now
+
+    # ── Поток-наблюдатель ─────────────────────────────────────
+    def _watch(self):
+        period  = min(self.threshold / 2, self.interval)
+        stalled = None   # время последнего пульса, с которого идёт зависание
+        while True:
+            time.sleep(period)
+            beat = self._beat
+            if time.monotonic() - beat > self.threshold + self.interval:
+                stalled = beat
+                self._sample()
+            elif stalled is not None and beat != stalled:
+                self._finish(beat - stalled - self.interval)
+                stalled = None
+
+    def _sample(self):
+        # стек сразу превращается в строки: кадры не держатся живыми, а номера
+        # строк — те, на которых loop стоял, а не те, куда корутина ушла потом
+        frame = sys._current_frames().get(self._loop_tid)
+        stack = []
+        while frame is not None and len(stack) < 40:
+            stack.append(frame)
+            frame = frame.f_back
+        lines = [f"{_frame_label(f)} ({os.path.basename(f.f_code.co_filename)}:{f.f_lineno})"
+                 for f in stack[:12]]
+        self._samples.append((self._culprit(stack), lines))
+        del stack, frame
+
+    @staticmethod
+    def _culprit(stack) -> str:
+        # самый глубокий кадр из кода бота; иначе — самый глубокий вообще
+        for frame in stack:
+            path = frame.f_code.co_filename
+            if path.startswith(_ROOT) and not path.endswith("loop_monitor.py"):
+                return _frame_label(frame)
+        return _frame_label(stack[0]) if stack else "?"
+
+    def _finish(self, seconds: float):
+        samples, self._samples = self._samples, []
+        if not samples:
+            return
+        votes   = Counter(culprit for culprit, _ in samples)
+        culprit = votes.most_common(1)[0][0]
+        stack   = next(lines for c, lines in samples if c == culprit)
+        ms      = seconds * 1000
+        entry   = {
+            "t":       round(time.time()),
+            "ms":      round(ms, 1),
+            "culprit": culprit,
+            "samples": len(samples),
+            "stack":   stack,
+        }
+        with self._lock:
+            self.culprits[culprit] += ms
+            self.stalls.append(entry)
+        print(f"[LAG] Event loop стоял {ms:.0f} мс — {culprit}")
+
+    # ── Отчёт ─────────────────────────────────────────────────
+    def report(self):
+        """(самые дорогие кадры [(кадр, мс)], последние зависания)."""
+        with self._lock:
+            return self.culprits.most_common(20), list(self.stalls)
+
+    def to_dict(self) -> dict:
+        culprits, stalls = self.report()
+        return {
+            "threshold_ms": self.threshold * 1000,
+            "lag":          self.lag.to_dict(),
+            "culprits":     {k: round(v, 1) for k, v in culprits},
+            "stalls":       stalls,
+        }
@@ -1,5 +1,6 @@
 import asyncio
 import os
+from collections import OrderedDict
 import discord
 from discord.ext import commands
 from dotenv import load_dotenv
@@ -7,6 +8,11 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from cogs.help_cmd import MyHelpCommand
+from data import (
+    flush_loop, flush_dirty, warm_up, dump_metrics,
+    MESSAGE_STATS, COMMAND_METRICS, LOOP_MONITOR, LOOP_LAG_MS,
+)
+from storage import drain
 
 # ── Intents ──────────────────────────────────────────────────
 intents = discord.Intents.default()
@@ -16,8 +22,10 @@ intents.voice_states    = True
 intents.guilds          = True
 
 # ── Bot instance ─────────────────────────────────────────────
+COMMAND_PREFIX = "!"
+
 bot = commands.Bot(
-    command_prefix="!",
+    command_prefix=COMMAND_PREFIX,
     intents=intents,
     case_insensitive=True,
     help_command=MyHelpCommand(),
@@ -38,6 +46,7 @@ COGS = [
     "cogs.petitions",
     "cogs.voice_ai",
     "cogs.mafia",
+    "cogs.stats",
 ]
 
 # ── Events ───────────────────────────────────────────────────
@@ -45,6 +54,39 @@ COGS = [
 async def on_ready():
     print(f"✅ {bot.user.name}#{bot.user.discriminator} запущен!")
     print(f"   Серверов: {len(bot.guilds)}")
+    if os.getenv("DATA_WARMUP", "1") == "1":
+        warm_up()
+
+# ── Message pipeline ─────────────────────────────────────────
+# Единственная точка разбора команд: XPCog.on_message больше не вызывает
+# process_commands, а дефолтный Bot.on_message заменён этим. Сообщения без
+# префикса сюда не доходят дальше проверки — для них работает только XP-слушатель.
+_recent_invoked: OrderedDict = OrderedDict()
+
+@bot.event
+async def on_message(message):
+    MESSAGE_STATS["messages"] += 1
+    if message.author.bot or not message.content.startswith(COMMAND_PREFIX):
+        return
+    MESSAGE_STATS["dispatched"] += 1
+    await bot.process_commands(message)
+
+@bot.before_invoke
+async def count_invoke(ctx):
+    COMMAND_METRICS.start(ctx)
+    MESSAGE_STATS["invoked"] += 1
+    mid = ctx.message.id
+    if mid in _recent_invoked:
+        MESSAGE_STATS["duplicates"] += 1
+        print(f"[WARN] Сообщение {mid} ('{ctx.command}') вызвано повторно!")
+        return
+    _recent_invoked[mid] = None
+    if len(_recent_invoked) > 1000:
+        _recent_invoked.popitem(last=False)
+
+@bot.after_invoke
+async def time_invoke(ctx):
+    COMMAND_METRICS.finish(ctx)
 
 @bot.event
 async def on_member_join(member):
@@ -62,6 +104,8 @@ async def on_member_join(member):
 
 @bot.event
 async def on_command_error(ctx, error):
+    if ctx.command is not None:
+        COMMAND_METRICS.error(ctx)
     if isinstance(error, commands.MissingPermissions):
         await ctx.send("❌ Недостаточно прав!", delete_after=5)
     elif isinstance(error, commands.MissingRequiredArgument):
@@ -91,7 +135,19 @@ async def main():
         TOKEN = os.getenv("DISCORD_BOT_TOKEN")
         if not TOKEN:
             raise ValueError("DISCORD_BOT_TOKEN не найден в .env файле!")
-        await bot.start(TOKEN)
+        bot.loop.create_task(flush_loop(bot))
+        COMMAND_METRICS.install_http_timing(bot)
+        if LOOP_LAG_MS > 0:
+            LOOP_MONITOR.start()
+        if os.getenv("METRICS_PORT"):
+            from exporter import start_exporter
+            await start_exporter(bot, int(os.getenv("METRICS_PORT")), os.getenv("METRICS_HOST", "127.0.0.1"))
+        try:
+            await bot.start(TOKEN)
+        finally:
+            dump_metrics()
+            flush_dirty()
+            drain()
 
 if __name__ == "__main__":
     asyncio.run(main())
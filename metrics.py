@@ -0,0 +1,196 @@
+"""
+metrics.py — время выполнения команд.
+Для каждой команды — гистограмма с фиксированными корзинами (память не
+растёт с числом вызовов), число ошибок и доля времени, ушедшая на запись
+данных и на HTTP-запросы к Discord. Время внутри команды собирается через
+contextvar: before_invoke/after_invoke и сама команда идут в одной задаче,
+поэтому обёртка HTTP-клиента и mark_dirty() в data.py добавляют время к той
+команде, которая их вызвала. Сама запись коллекций идёт в flush_loop, вне
+команд, — её время копится отдельно, в гистограмме writes.
+"""
+import bisect
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# верхние границы корзин, мс; последняя — всё, что дольше
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, float("inf"))
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS_MS)
+        self.count  = 0
+        self.total  = 0.0
+        self.max    = 0.0
+
+    def observe(self, ms: float):
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, p: float) -> float:
+        """Верхняя граница корзины, в которую попадает p-й перцентиль (мс)."""
+        if not self.count:
+            return 0.0
+        rank = p / 100 * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS_MS, self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self) -> dict:
+        return {"count": self.count, "mean_ms": round(self.mean, 3), "max_ms": round(self.max, 3),
+                "p50_ms": self.percentile(50), "p99_ms": self.percentile(99),
+                "buckets": {("inf" if b == float("inf") else str(b)): n
+                            for b, n in zip(BUCKETS_MS, self.counts)}}
+
+
+class _Timing:
+    __slots__ = ("start", "api", "persist", "api_calls")
+
+    def __init__(self):
+        self.start     = time.perf_counter()
+        self.api       = 0.0
+        self.persist   = 0.0
+        self.api_calls = 0
+
+
+class _CommandStats:
+    __slots__ = ("latency", "errors", "api", "persist", "api_calls")
+
+    def __init__(self):
+        self.latency   = Histogram()
+        self.errors    = 0
+        self.api       = 0.0   # мс суммарно
+        self.persist   = 0.0
+        self.api_calls = 0
+
+
+_current: ContextVar = ContextVar("command_timing", default=None)
+
+
+class CommandMetrics:
+    def __init__(self, slow_ms: float = 1000, slow_log_size: int = 50):
+        self.slow_ms      = slow_ms
+        self.commands     = {}                            # имя команды -> _CommandStats
+        self.slow_log     = deque(maxlen=slow_log_size)
+        self.api          = Histogram()                   # все HTTP-запросы к Discord
+        self.writes       = Histogram()                   # все вызовы data._write() (фон и синхронные)
+        self.write_errors = 0                             # записи, не удавшиеся в потоке storage
+        self.external     = {}                            # внешний сервис (groq, tts) -> Histogram
+        self.since        = time.time()
+
+    def _stats(self, name: str) -> _CommandStats:
+        stats = self.commands.get(name)
+        if stats is None:
+            stats = self.commands[name] = _CommandStats()
+        return stats
+
+    # ── Хуки команд ───────────────────────────────────────────
+    def start(self, ctx):
+        ctx._metrics_timing = _Timing()
+        _current.set(ctx._metrics_timing)
+
+    def finish(self, ctx):
+        timing = getattr(ctx, "_metrics_timing", None)
+        if timing is None:
+            return
+        _current.set(None)
+        ms    = (time.perf_counter() - timing.start) * 1000
+        name  = ctx.command.qualified_name if ctx.command else "?"
+        stats = self._stats(name)
+        stats.latency.observe(ms)
+        stats.api       += timing.api
+        stats.persist   += timing.persist
+        stats.api_calls += timing.api_calls
+        if ms >= self.slow_ms:
+            entry = {"t": round(time.time()), "command": name, "user": ctx.author.id,
+                     "ms": round(ms, 1), "api_ms": round(timing.api, 1),
+                     "api_calls": timing.api_calls, "persist_ms": round(timing.persist, 1)}
+            self.slow_log.append(entry)
+            print(f"[SLOW] !{name}: {ms:.0f} мс (API {timing.api:.0f} мс / "
+                  f"{timing.api_calls} запр., запись {timing.persist:.0f} мс)")
+
+    def error(self, ctx):
+        self._stats(ctx.command.qualified_name if ctx.command else "?").errors += 1
+
+    # ── Учёт времени внутри команды ───────────────────────────
+    def add_api(self, ms: float):
+        self.api.observe(ms)
+        timing = _current.get()
+        if timing is not None:
+            timing.api       += ms
+            timing.api_calls += 1
+
+    def add_persist(self, ms: float):
+        """Время сохранения, которое команда заплатила сама (mark_dirty и синхронная запись)."""
+        timing = _current.get()
+        if timing is not None:
+            timing.persist += ms
+
+    def add_write(self, ms: float):
+        self.writes.observe(ms)
+
+    def add_write_error(self):
+        self.write_errors += 1
+
+    @contextmanager
+    def timed(self, service: str):
+        """with COMMAND_METRICS.timed("groq"): ... — время вызова внешнего сервиса."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            hist = self.external.get(service)
+            if hist is None:
+                hist = self.external[service] = Histogram()
+            hist.observe((time.perf_counter() - t0) * 1000)
+
+    def install_http_timing(self, bot):
+        """Обернуть bot.http.request — через него идут все REST-запросы к Discord."""
+        http    = bot.http
+        request = http.request
+        if getattr(request, "_timed", False):
+            return
+
+        async def timed_request(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return await request(*args, **kwargs)
+            finally:
+                self.add_api((time.perf_counter() - t0) * 1000)
+        timed_request._timed = True
+        http.request = timed_request
+
+    # ── Отчёты ────────────────────────────────────────────────
+    def top(self, n: int = 10, key: str = "p99"):
+        def score(item):
+            s = item[1]
+            return s.latency.percentile(99) if key == "p99" else s.latency.count
+        return sorted(self.commands.items(), key=score, reverse=True)[:n]
+
+    def to_dict(self) -> dict:
+        return {
+            "since":    self.since,
+            "dumped":   time.time(),
+            "api":      self.api.to_dict(),
+            "writes":   {**self.writes.to_dict(), "errors": self.write_errors},
+            "external": {name: h.to_dict() for name, h in self.external.items()},
+            "commands": {name: {**s.latency.to_dict(), "errors": s.errors,
+                                "api_ms": round(s.api, 1), "api_calls": s.api_calls,
+                                "persist_ms": round(s.persist, 1)}
+                         for name, s in self.commands.items()},
+            "slow":     list(self.slow_log),
+        }
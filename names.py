@@ -0,0 +1,78 @@
+"""
+names.py — кеш отображаемых имён участников для рейтингов.
+Раньше !top и !toplevel звали get_member() или fetch_member() на каждую
+строку, то есть до десяти REST-запросов подряд на одну команду.
+NameCache отвечает из памяти, берёт найденных участников из кеша гильдии,
+а остальных запрашивает одним запросом участников через gateway. Ушедшие
+игроки запоминаются как «нет имени» на короткий срок, чтобы не искать их
+при каждом показе рейтинга.
+"""
+import asyncio
+import time
+
+QUERY_LIMIT = 100   # максимум user_ids в одном запросе участников
+
+
+class NameCache:
+    def __init__(self, ttl: float = 600, missing_ttl: float = 120,
+                 query_timeout: float = 3, max_size: int = 5000):
+        self.ttl           = ttl
+        self.missing_ttl   = missing_ttl
+        self.query_timeout = query_timeout
+        self.max_size      = max_size
+        self._names        = {}   # (guild_id, uid) -> (имя или None, время истечения)
+
+    def get(self, guild_id, uid):
+        """(найдено, имя): имя None — игрок известен как ушедший."""
+        entry = self._names.get((guild_id, uid))
+        if entry is None or entry[1] <= time.time():
+            return False, None
+        return True, entry[0]
+
+    def put(self, guild_id, uid, name):
+        if len(self._names) >= self.max_size:
+            self._purge()
+        ttl = self.ttl if name is not None else self.missing_ttl
+        self._names[(guild_id, uid)] = (name, time.time() + ttl)
+
+    def _purge(self):
+        now = time.time()
+        self._names = {k: v for k, v in self._names.items() if v[1] > now}
+        if len(self._names) >= self.max_size:
+            self._names.clear()
+
+    async def resolve(self, guild, uids) -> dict:
+        """{uid: имя} для всех uids; кого нет на сервере — упоминание <@uid>."""
+        names, missing = {}, []
+        for uid in uids:
+            found, name = self.get(guild.id, uid)
+            if not found:
+                m = guild.get_member(int(uid))
+                if m is None:
+                    missing.append(uid)
+                    continue
+                name = m.display_name
+                self.put(guild.id, uid, name)
+            names[uid] = name if name is not None else f"<@{uid}>"
+        for i in range(0, len(missing), QUERY_LIMIT):
+            chunk = missing[i:i + QUERY_LIMIT]
+            try:
+                members = await asyncio.wait_for(
+                    guild.query_members(user_ids=[int(u) for u in chunk], limit=len(chunk), cache=True),
+                    self.query_timeout,
+                )
+            except Exception as e:
+                # не получилось — покажем упоминания, но в кеш не записываем
+                print(f"[NAMES] Не удалось запросить участников: {e}")
+                for uid in chunk:
+                    names[uid] = f"<@{uid}>"
+                continue
+            got = {str(m.id): m.display_name for m in members}
+            for uid in chunk:
+                name = got.get(uid)
+                self.put(guild.id, uid, name)
+                names[uid] = name if name is not None else f"<@{uid}>"
+        return names
+
+    def __len__(self):
+        return len(self._names)
@@ -0,0 +1,108 @@
+"""
+orders.py — компактное состояние заказа на складе.
+Раньше заказ был списком dict-ов со статусом-строкой, и каждый скан
+несколько раз фильтровал весь список. Order хранит собранные позиции
+битовой маской (int), ведёт счётчики done/remaining и кеширует
+отрисованные строки пикап-листа: скан — это O(собранных за клик), а
+сообщение собирается из не более чем 30 готовых строк.
+"""
+
+
+class Order:
+    __slots__ = ("locations", "items", "picked", "done", "_todo_lines", "_done_lines")
+
+    def __init__(self, items: list, locations: list = None):
+        self.items       = items
+        self.locations   = locations   # None — заказ без ячеек (баление)
+        self.picked      = 0           # бит i — позиция i собрана
+        self.done        = 0
+        self._todo_lines = [None] * len(items)
+        self._done_lines = [None] * len(items)
+
+    @classmethod
+    def from_positions(cls, positions) -> "Order":
+        """Из [(ячейка, товар)] — формат Catalogue.order()."""
+        locations, items = zip(*positions) if positions else ((), ())
+        return cls(list(items), list(locations))
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def remaining(self) -> int:
+        return len(self.items) - self.done
+
+    def is_picked(self, i: int) -> bool:
+        return self.picked >> i & 1 == 1
+
+    # ── Сбор ──────────────────────────────────────────────────
+    def _unpicked(self, start: int = 0):
+        """Индексы несобранных позиций по порядку, начиная с start."""
+        free = ~self.picked >> start
+        i    = start
+        n    = len(self.items)
+        while i < n:
+            if free & 1:
+                yield i
+            free >>= 1
+            i    += 1
+
+    def first_unpicked(self) -> int:
+        """Индекс первой несобранной позиции (len(self), если всё собрано)."""
+        x = self.picked
+        return min(len(self.items), (~x & (x + 1)).bit_length() - 1)
+
+    def pick(self, n: int) -> list:
+        """Собрать до n первых несобранных позиций; вернуть их индексы."""
+        got = []
+        for i in self._unpicked(self.first_unpicked()):
+            if len(got) >= n:
+                break
+            self.picked |= 1 << i
+            got.append(i)
+        self.done += len(got)
+        return got
+
+    # ── Отрисовка ─────────────────────────────────────────────
+    def line(self, i: int) -> str:
+        text = self._todo_lines[i]
+        if text is None:
+            if self.locations is None:
+                text = f"{i+1}. {self.items[i]}"
+            else:
+                text = f"{i+1}. {self.locations[i]} ({self.items[i]})"
+            self._todo_lines[i] = text
+        return text
+
+    def done_line(self, i: int) -> str:
+        text = self._done_lines[i]
+        if text is None:
+            text = self._done_lines[i] = f"✅ ~~{self.line(i)}~~"
+        return text
+
+    def last_done(self, k: int) -> list:
+        """Индексы последних k собранных позиций (по порядку в листе)."""
+        x, out = self.picked, []
+        while x and len(out) < k:
+            i = x.bit_length() - 1
+            out.append(i)
+            x ^= 1 << i
+        out.reverse()
+        return out
+
+    def first_todo(self, k: int) -> list:
+        out = []
+        for i in self._unpicked(self.first_unpicked()):
+            if len(out) >= k:
+                break
+            out.append(i)
+        return out
+
+    def progress_text(self, done_shown: int = 10, todo_shown: int = 20) -> str:
+        """Собранные (последние done_shown) и оставшиеся (первые todo_shown) строки."""
+        return ("\n".join(self.done_line(i) for i in self.last_done(done_shown)) + "\n\n"
+                + "\n".join(self.line(i) for i in self.first_todo(todo_shown)))
+
+    def pickup_list(self, limit: int = 1800) -> str:
+        text = "\n".join(self.line(i) for i in range(len(self.items)))
+        return text if len(text) <= limit else text[:limit] + "..."
@@ -0,0 +1,218 @@
+"""
+outbox.py — очередь исходящих сообщений по каналам.
+Подряд идущие короткие отправки в один канал в пределах короткого окна
+склеиваются в одно сообщение (до 2000 символов), так что блэкджек тратит на
+начало раунда один REST-запрос вместо трёх, а начисление прибыли бизнесов —
+одно сообщение на несколько десятков игроков. Ответы на команды
+(INTERACTIVE) всегда уходят раньше рассылок (BROADCAST). Лимиты запросов
+соблюдает сам py-cord: своих корзин у очереди нет — она видела бы только
+свой трафик, а не прямые ctx.send в тот же канал, и только добавляла бы ожидание.
+
+DeleteQueue — то же для удаления сообщений с командами: команда не ждёт
+удаления, а накопившиеся в канале сообщения удаляются одним bulk delete.
+"""
+import asyncio
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+
+INTERACTIVE = 0
+BROADCAST   = 1
+
+MAX_LENGTH = 2000
+BULK_LIMIT = 100                  # сообщений в одном bulk delete
+BULK_AGE   = timedelta(days=14)   # старше bulk delete не принимает (с запасом ниже)
+
+
+class _Bucket:
+    """Токен-бакет: capacity запросов, пополняется на capacity за period секунд."""
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.rate     = capacity / period
+        self.tokens   = float(capacity)
+        self.updated  = time.monotonic()
+
+    def wait_time(self) -> float:
+        now          = time.monotonic()
+        self.tokens  = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    async def acquire(self):
+        while (delay := self.wait_time()) > 0:
+            await asyncio.sleep(delay)
+        self.tokens -= 1
+
+
+class _Item:
+    __slots__ = ("content", "kwargs", "future")
+
+    def __init__(self, content, kwargs, future):
+        self.content = content
+        self.kwargs  = kwargs
+        self.future  = future
+
+    def mergeable(self) -> bool:
+        # склеивается только простой текст; embed/view/файлы уходят как есть
+        return isinstance(self.content, str) and set(self.kwargs) <= {"delete_after"}
+
+
+class _ChannelQueue:
+    def __init__(self, channel):
+        self.channel = channel
+        self.items   = (deque(), deque())   # по приоритетам
+        self.wakeup  = asyncio.Event()   # пришло любое сообщение
+        self.urgent  = asyncio.Event()   # пришёл ответ на команду
+        self.task    = None
+
+
+def _log_error(future):
+    if not future.cancelled() and future.exception() is not None:
+        print(f"[OUTBOX] Ошибка отправки: {future.exception()}")
+
+
+class Outbox:
+    def __init__(self, windows=(0.05, 1.0), idle_timeout: float = 60):
+        self.windows      = windows        # сколько ждать соседей перед отправкой, по приоритету
+        self.idle_timeout = idle_timeout
+        self._queues      = {}             # channel.id -> _ChannelQueue
+        self.stats        = {"queued": 0, "sent": 0, "merged": 0, "failed": 0}
+
+    def post(self, channel, content=None, *, priority: int = INTERACTIVE, **kwargs) -> asyncio.Future:
+        """Поставить сообщение в очередь; future даёт отправленный discord.Message."""
+        q = self._queues.get(channel.id)
+        if q is None:
+            q = self._queues[channel.id] = _ChannelQueue(channel)
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_log_error)
+        q.items[priority].append(_Item(content, kwargs, future))
+        q.wakeup.set()
+        if priority == INTERACTIVE:
+            q.urgent.set()
+        if q.task is None or q.task.done():
+            q.task = asyncio.get_running_loop().create_task(self._run(q))
+        self.stats["queued"] += 1
+        return future
+
+    async def send(self, channel, content=None, *, priority: int = INTERACTIVE, **kwargs):
+        """То же, что channel.send(), но через очередь; ждёт отправки."""
+        return await self.post(channel, content, priority=priority, **kwargs)
+
+    def __len__(self):
+        return sum(len(d) for q in self._queues.values() for d in q.items)
+
+    # ── Отправка ──────────────────────────────────────────────
+    async def _run(self, q: _ChannelQueue):
+        while True:
+            if not (q.items[INTERACTIVE] or q.items[BROADCAST]):
+                q.wakeup.clear()
+                try:
+                    await asyncio.wait_for(q.wakeup.wait(), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    if not (q.items[INTERACTIVE] or q.items[BROADCAST]):
+                        self._queues.pop(q.channel.id, None)
+                        return
+                continue
+            if q.items[INTERACTIVE]:
+                await asyncio.sleep(self.windows[INTERACTIVE])
+            else:
+                # рассылка ждёт соседей дольше, но ответ на команду прерывает ожидание
+                q.urgent.clear()
+                try:
+                    await asyncio.wait_for(q.urgent.wait(), self.windows[BROADCAST])
+                    continue
+                except asyncio.TimeoutError:
+                    pass
+            # за время ожидания мог прийти ответ на команду — он идёт первым
+            prio  = INTERACTIVE if q.items[INTERACTIVE] else BROADCAST
+            batch = self._take(q.items[prio])
+            try:
+                msg = await q.channel.send(batch[0].content if len(batch) == 1 else
+                                           "\n".join(i.content for i in batch), **batch[0].kwargs)
+            except Exception as e:
+                self.stats["failed"] += 1
+                for item in batch:
+                    if not item.future.done():
+                        item.future.set_exception(e)
+                continue
+            self.stats["sent"]   += 1
+            self.stats["merged"] += len(batch) - 1
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_result(msg)
+
+    @staticmethod
+    def _take(items: deque) -> list:
+        batch = [items.popleft()]
+        if not batch[0].mergeable():
+            return batch
+        size = len(batch[0].content)
+        while items and items[0].mergeable() and items[0].kwargs == batch[0].kwargs \
+                and size + 1 + len(items[0].content) <= MAX_LENGTH:
+            size += 1 + len(items[0].content)
+            batch.append(items.popleft())
+        return batch
+
+
+class DeleteQueue:
+    def __init__(self, window: float = 0.5, per_channel=(5, 5.0)):
+        self.window      = window
+        self.per_channel = per_channel
+        self._pending    = {}   # channel.id -> [message]
+        self._buckets    = {}   # channel.id -> _Bucket
+        self._tasks      = {}   # channel.id -> задача, удаляющая пачку
+        self.stats       = {"queued": 0, "deleted": 0, "bulk_calls": 0, "single_calls": 0, "failed": 0}
+
+    def add(self, message):
+        """Удалить сообщение в фоне; команда продолжает работу сразу."""
+        cid = message.channel.id
+        self._pending.setdefault(cid, []).append(message)
+        self.stats["queued"] += 1
+        task = self._tasks.get(cid)
+        if task is None or task.done():
+            self._tasks[cid] = asyncio.get_running_loop().create_task(self._run(message.channel))
+
+    def __len__(self):
+        return sum(len(v) for v in self._pending.values())
+
+    async def _run(self, channel):
+        cid    = channel.id
+        bucket = self._buckets.get(cid)
+        if bucket is None:
+            bucket = self._buckets[cid] = _Bucket(*self.per_channel)
+        while self._pending.get(cid):
+            await asyncio.sleep(self.window)
+            await bucket.acquire()
+            pending = self._pending[cid]
+            batch, self._pending[cid] = pending[:BULK_LIMIT], pending[BULK_LIMIT:]
+            await self._delete(channel, batch)
+        self._pending.pop(cid, None)
+        self._tasks.pop(cid, None)
+
+    @staticmethod
+    def _can_bulk(channel, batch) -> bool:
+        if len(batch) < 2 or not hasattr(channel, "delete_messages"):
+            return False
+        guild = getattr(channel, "guild", None)
+        if guild is None or not channel.permissions_for(guild.me).manage_messages:
+            return False
+        oldest = datetime.now(timezone.utc) - BULK_AGE + timedelta(minutes=5)
+        return all(m.created_at > oldest for m in batch)
+
+    async def _delete(self, channel, batch):
+        if self._can_bulk(channel, batch):
+            try:
+                await channel.delete_messages(batch)
+                self.stats["bulk_calls"] += 1
+                self.stats["deleted"]    += len(batch)
+                return
+            except Exception as e:
+                print(f"[OUTBOX] Bulk delete не удался ({e}), удаляю по одному")
+        for message in batch:
+            try:
+                await message.delete()
+                self.stats["deleted"] += 1
+            except Exception:
+                self.stats["failed"] += 1   # уже удалено, нет прав или это ЛС
+            self.stats["single_calls"] += 1
@@ -0,0 +1,153 @@
+"""
+players.py — компактное хранилище данных игроков.
+Всё, что относится к одному игроку, — поля одного PlayerRecord (__slots__),
+записи лежат в одном dict по int id. Старые имена из data.py (player_funds,
+player_xp, ...) остаются как FieldView — dict-подобные представления одного
+поля со строковыми ключами, так что cog-модули работают без изменений.
+"""
+from collections.abc import MutableMapping
+
+MISSING = object()   # поле не задано — для FieldView это «ключа нет»
+
+FIELDS = ("funds", "bank", "xp", "daily", "inventory", "priemer", "warns", "loans", "businesses")
+
+
+class PlayerRecord:
+    __slots__ = FIELDS
+
+    def __init__(self):
+        self.funds = self.bank = self.xp = self.daily = self.inventory = MISSING
+        self.priemer = self.warns = self.loans = self.businesses = MISSING
+
+    def get(self, field: str, default=None):
+        value = getattr(self, field)
+        return default if value is MISSING else value
+
+
+EMPTY = PlayerRecord()
+
+
+class FieldView(MutableMapping):
+    """
+    player_<field>[str(uid)] поверх PlayerStore. listeners вызываются как
+    fn(key, old, new) на каждое изменение (new=MISSING — удаление).
+    loader(view) наполняет поле при первом обращении к представлению.
+    """
+
+    def __init__(self, store: "PlayerStore", field: str, loader=None):
+        self._store    = store
+        self._records  = store.records
+        self._field    = field
+        self._len      = 0
+        self._loader   = loader
+        self.listeners = []
+
+    def set_loader(self, loader):
+        self._loader = loader
+
+    def ensure_loaded(self):
+        if self._loader is not None:
+            loader, self._loader = self._loader, None
+            loader(self)
+
+    def load(self, data: dict):
+        for key, value in data.items():
+            try:
+                self.set_raw(key, value)
+            except ValueError:
+                print(f"[DATA] {self._field}: пропущен некорректный id {key!r}")
+
+    def set_raw(self, key, value):
+        """Записать значение без уведомления listeners (загрузка, проигрывание журнала)."""
+        rec = self._store.record(int(key))
+        if getattr(rec, self._field) is MISSING:
+            self._len += 1
+        setattr(rec, self._field, value)
+
+    def pop_raw(self, key):
+        rec = self._records.get(int(key))
+        if rec is not None and getattr(rec, self._field) is not MISSING:
+            setattr(rec, self._field, MISSING)
+            self._len -= 1
+
+    def _value(self, key):
+        if self._loader is not None:
+            self.ensure_loaded()
+        try:
+            rec = self._records.get(int(key))
+        except (TypeError, ValueError):
+            return MISSING
+        return MISSING if rec is None else getattr(rec, self._field)
+
+    # ── Mapping API ───────────────────────────────────────────
+    def __getitem__(self, key):
+        value = self._value(key)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        value = self._value(key)
+        return default if value is MISSING else value
+
+    def __contains__(self, key):
+        return self._value(key) is not MISSING
+
+    def __setitem__(self, key, value):
+        old = self._value(key)
+        self.set_raw(key, value)
+        for fn in self.listeners:
+            fn(key, old, value)
+
+    def __delitem__(self, key):
+        old = self._value(key)
+        if old is MISSING:
+            raise KeyError(key)
+        self.pop_raw(key)
+        for fn in self.listeners:
+            fn(key, old, MISSING)
+
+    def __iter__(self):
+        self.ensure_loaded()
+        field = self._field
+        return iter([str(uid) for uid, rec in self._records.items()
+                     if getattr(rec, field) is not MISSING])
+
+    def __len__(self):
+        self.ensure_loaded()
+        return self._len
+
+    def items(self):
+        self.ensure_loaded()
+        field = self._field
+        return [(str(uid), v) for uid, rec in self._records.items()
+                if (v := getattr(rec, field)) is not MISSING]
+
+    def values(self):
+        return [v for _, v in self.items()]
+
+
+class PlayerStore:
+    def __init__(self):
+        self.records: dict = {}
+        self.views:   dict = {}
+
+    def record(self, uid: int) -> PlayerRecord:
+        rec = self.records.get(uid)
+        if rec is None:
+            rec = self.records[uid] = PlayerRecord()
+        return rec
+
+    def get(self, uid) -> PlayerRecord:
+        """Одна запись игрока за один поиск; для неизвестного игрока — EMPTY."""
+        self.ensure_loaded()
+        return self.records.get(int(uid), EMPTY)
+
+    def ensure_loaded(self):
+        for view in self.views.values():
+            view.ensure_loaded()
+
+    def view(self, field: str, loader=None) -> FieldView:
+        if field not in self.views:
+            self.views[field] = FieldView(self, field, loader)
+        return self.views[field]
@@ -0,0 +1,116 @@
+"""
+priemer.py — приемер работников склада без фонового пересчёта.
+Раньше WorkCog раз в минуту обходил всех в priemer_data, добавлял прирост
+от заказов за минуту, раз в час снимал 1 у простаивающих и сохранял файл
+в любом случае. Priemer пересчитывает значение только на событиях:
+завершённый заказ сразу даёт прирост, а падение за простой считается
+лениво при чтении — по времени последней активности. Пустые минуты
+ничего не стоят, а сохранение запрашивается, только если что-то изменилось.
+История заказов для разбивки в !priemer — кольцевые буферы rolling.OrderRing.
+"""
+import time
+from rolling import OrderRing
+
+WINDOWS = (("1ч", 3600), ("24ч", 86400), ("7д", 7 * 86400))
+
+
+class Priemer:
+    def __init__(self, values, cap: int = 150, decay_every: float = 3600, loader=None, on_change=None,
+                 windows=WINDOWS, history: int = 512):
+        self.values      = values       # uid -> int (priemer_data)
+        self.cap         = cap
+        self.decay_every = decay_every  # секунд простоя на -1
+        self.on_change   = on_change    # вызывается после изменения — для сохранения
+        self.windows     = windows      # (подпись, секунд) для stats()
+        self.history     = history      # ёмкость буфера заказов на работника
+        self._loader     = loader       # -> {uid: {"at", "carry", "orders"}}, при первом обращении
+        self._at         = {}           # uid -> время, с которого считается простой
+        self._carry      = {}           # uid -> дробная часть прироста (< 1)
+        self._rings      = {}           # uid -> OrderRing
+
+    def _ensure_loaded(self):
+        if self._loader is not None:
+            loader, self._loader = self._loader, None
+            for uid, state in loader().items():
+                self._at[uid] = state.get("at", time.time())
+                if state.get("carry"):
+                    self._carry[uid] = state["carry"]
+                for when, size in state.get("orders", ()):
+                    self._ring(uid).push(size, when)
+
+    def _ring(self, uid) -> OrderRing:
+        ring = self._rings.get(uid)
+        if ring is None:
+            ring = self._rings[uid] = OrderRing((span for _, span in self.windows), self.history)
+        return ring
+
+    def _decay(self, uid, now) -> bool:
+        at = self._at.get(uid)
+        if at is None:
+            if uid not in self.values:
+                return False   # не работник — отметка появится с первым заказом
+            # работник без отметки (старые данные) — простой считается с этого момента
+            self._at[uid] = now
+            return True
+        steps = int((now - at) // self.decay_every)
+        if steps <= 0:
+            return False
+        self._at[uid] = at + steps * self.decay_every
+        value = self.values.get(uid, 0)
+        if value <= 0:
+            return False   # сдвиг отметки у нулевого приемера сохранять незачем
+        self.values[uid] = max(0, value - steps)
+        return True
+
+    # ── API ───────────────────────────────────────────────────
+    def get(self, uid, now: float = None) -> int:
+        """Текущий приемер с учётом простоя; сохранение — только если он изменился."""
+        self._ensure_loaded()
+        if now is None:
+            now = time.time()
+        if self._decay(uid, now) and self.on_change:
+            self.on_change()
+        return self.values.get(uid, 0)
+
+    def add_order(self, uid, size: int, now: float = None) -> int:
+        """Учесть завершённый заказ из size позиций: +size/10, не выше cap."""
+        self._ensure_loaded()
+        if now is None:
+            now = time.time()
+        self._decay(uid, now)
+        total = min(self.cap, self.values.get(uid, 0) + self._carry.get(uid, 0) + size / 10)
+        value = int(total)
+        self.values[uid] = value
+        self._at[uid]    = now
+        self._ring(uid).push(size, now)
+        if total - value > 0:
+            self._carry[uid] = round(total - value, 3)
+        else:
+            self._carry.pop(uid, None)
+        if self.on_change:
+            self.on_change()
+        return value
+
+    def stats(self, uid, now: float = None) -> list:
+        """[(подпись, секунд, заказов, позиций)] по окнам self.windows."""
+        self._ensure_loaded()
+        if now is None:
+            now = time.time()
+        ring = self._rings.get(uid)
+        return [(label, span, *(ring.window(w, now) if ring else (0, 0)))
+                for w, (label, span) in enumerate(self.windows)]
+
+    def dump(self) -> dict:
+        self._ensure_loaded()
+        since = time.time() - max(span for _, span in self.windows)
+        out   = {}
+        for uid, at in self._at.items():
+            state = out[uid] = {"at": at, "carry": self._carry.get(uid, 0)}
+            ring  = self._rings.get(uid)
+            if ring is not None:
+                state["orders"] = [list(e) for e in ring.entries(since)]
+        return out
+
+    def __len__(self):
+        self._ensure_loaded()
+        return len(self._at)
@@ -0,0 +1,60 @@
+"""
+ranking.py — рейтинги, которые обновляются по мере изменения данных.
+RankIndex держит игроков отсортированными по убыванию очков (SortedList),
+поэтому топ-N, место игрока и любая страница рейтинга — O(log n) без
+пересортировки всех игроков на каждый запрос.
+"""
+from sortedcontainers import SortedList
+
+
+class RankIndex:
+    def __init__(self, build):
+        self._build  = build          # -> iterable[(uid, score)], вызывается при первом запросе
+        self._scores = {}
+        self._sorted = SortedList()   # (-score, uid)
+
+    def _ensure_built(self):
+        if self._build is not None:
+            build, self._build = self._build, None
+            for uid, score in build():
+                self._scores[uid] = score
+            self._sorted.update((-score, uid) for uid, score in self._scores.items())
+
+    def update(self, uid, score):
+        if self._build is not None:
+            return   # индекс ещё не построен — построится из актуальных данных
+        old = self._scores.get(uid)
+        if old == score:
+            return
+        if old is not None:
+            self._sorted.remove((-old, uid))
+        self._scores[uid] = score
+        self._sorted.add((-score, uid))
+
+    def remove(self, uid):
+        if self._build is not None:
+            return
+        old = self._scores.pop(uid, None)
+        if old is not None:
+            self._sorted.remove((-old, uid))
+
+    def top(self, n: int, offset: int = 0) -> list:
+        """[(uid, score)] для мест offset+1 … offset+n."""
+        self._ensure_built()
+        return [(uid, -neg) for neg, uid in self._sorted.islice(offset, offset + n)]
+
+    def rank(self, uid):
+        """Место игрока (с 1) или None."""
+        self._ensure_built()
+        score = self._scores.get(uid)
+        if score is None:
+            return None
+        return self._sorted.index((-score, uid)) + 1
+
+    def score(self, uid, default=0):
+        self._ensure_built()
+        return self._scores.get(uid, default)
+
+    def __len__(self):
+        self._ensure_built()
+        return len(self._sorted)
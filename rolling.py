@@ -0,0 +1,68 @@
+"""
+rolling.py — скользящие окна по заказам работника на кольцевом буфере.
+Размеры заказов и время завершения лежат в двух array фиксированной
+ёмкости, так что память на работника не растёт. Для каждого окна (1ч,
+24ч, 7д …) хранится индекс самой старой записи в окне и сумма размеров:
+новая запись прибавляется ко всем окнам, устаревшие вычитаются при
+сдвиге хвоста — каждая запись покидает окно один раз, поэтому запрос и
+добавление стоят амортизированно O(1) на окно, без прохода по истории.
+Если ёмкости не хватает на всё окно, оно считает последние capacity заказов.
+"""
+from array import array
+
+MAX_SIZE = 0xFFFF   # размер заказа хранится в unsigned short
+
+
+class OrderRing:
+    __slots__ = ("spans", "sizes", "times", "head", "_tails", "_sums")
+
+    def __init__(self, spans, capacity: int = 512):
+        self.spans  = tuple(spans)                 # длины окон в секундах
+        self.sizes  = array("H", [0]) * capacity
+        self.times  = array("d", [0.0]) * capacity
+        self.head   = 0                            # сколько записей добавлено всего
+        self._tails = [0] * len(self.spans)        # номер самой старой записи в окне
+        self._sums  = [0] * len(self.spans)        # сумма размеров в окне
+
+    def __len__(self):
+        """Записей в буфере (не больше ёмкости)."""
+        return min(self.head, len(self.sizes))
+
+    def push(self, size: int, when: float):
+        """Добавить заказ из size позиций, завершённый в when (время не убывает)."""
+        cap, slot = len(self.sizes), self.head % len(self.sizes)
+        if self.head >= cap:
+            # затираемая запись ещё может быть в длинных окнах — сначала вычесть её
+            oldest = self.head - cap
+            for w, tail in enumerate(self._tails):
+                if tail == oldest:
+                    self._sums[w] -= self.sizes[slot]
+                    self._tails[w] = tail + 1
+        size = min(max(0, size), MAX_SIZE)
+        self.sizes[slot] = size
+        self.times[slot] = when
+        self.head       += 1
+        for w in range(len(self._sums)):
+            self._sums[w] += size
+        self.advance(when)
+
+    def advance(self, now: float):
+        """Выбросить из окон записи старше их длины."""
+        cap, head, times, sizes = len(self.sizes), self.head, self.times, self.sizes
+        for w, span in enumerate(self.spans):
+            tail, total, cutoff = self._tails[w], self._sums[w], now - span
+            while tail < head and times[tail % cap] <= cutoff:
+                total -= sizes[tail % cap]
+                tail  += 1
+            self._tails[w], self._sums[w] = tail, total
+
+    def window(self, w: int, now: float):
+        """(заказов, позиций) за окно номер w на момент now."""
+        self.advance(now)
+        return self.head - self._tails[w], self._sums[w]
+
+    def entries(self, since: float = float("-inf")) -> list:
+        """[(время, размер)] по возрастанию времени, новее since — для сохранения."""
+        cap = len(self.sizes)
+        return [(self.times[i % cap], self.sizes[i % cap])
+                for i in range(max(0, self.head - cap), self.head) if self.times[i % cap] > since]
@@ -0,0 +1,175 @@
+"""
+sqlite_store.py — SQLite (WAL) бэкенд для коллекций игроков.
+Каждая коллекция — отдельная таблица (key, value) со значением в JSON.
+SQLiteCollection ведёт себя как dict, поэтому cog-модули не меняются:
+player_funds[uid], .get(), in, итерация работают как раньше.
+"""
+import json
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+from storage import snapshot, submit
+
+_MISSING = object()
+_local   = threading.local()
+
+
+def connect(path):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def _writer_conn(path):
+    # Поток-писатель держит своё соединение; читатели в event loop не ждут его (WAL)
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    if path not in conns:
+        conns[path] = connect(path)
+    return conns[path]
+
+
+class SQLiteCollection(MutableMapping):
+    """
+    Строки читаются по требованию и остаются в кеше — кеш главный источник
+    правды для всех тронутых ключей (удалённые хранятся как _MISSING), так что
+    ещё не записанные изменения никогда не перечитываются из БД. commit()
+    отдаёт потоку-писателю только изменённые строки (upsert/delete).
+    listeners — как у players.FieldView: fn(key, old, new) на каждое изменение.
+    """
+
+    def __init__(self, conn, table: str, json_path: str = None):
+        self._conn     = conn
+        self._db_path  = conn.execute("PRAGMA database_list").fetchone()[2]
+        self._table    = table
+        self._cache    = {}
+        self._dirty    = set()
+        self._deleted  = set()
+        self._complete = False
+        self.listeners = []
+        conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+        conn.commit()
+        if json_path:
+            self._import_json(json_path)
+
+    def _import_json(self, path):
+        # Одноразовая миграция из старого JSON-файла. Факт миграции хранится в
+        # таблице meta: таблица, которую бот честно опустошил, не должна снова
+        # наполняться из устаревшего JSON при каждом перезапуске.
+        self._conn.execute('CREATE TABLE IF NOT EXISTS "meta" (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+        mark = f"imported:{self._table}"
+        if self._conn.execute('SELECT 1 FROM "meta" WHERE key = ?', (mark,)).fetchone():
+            return
+        data = None
+        # БД, созданная до таблицы meta, уже мигрирована, если в таблице есть строки
+        if not self._conn.execute(f'SELECT 1 FROM "{self._table}" LIMIT 1').fetchone():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                pass
+        with self._conn:
+            if isinstance(data, dict):
+                self._conn.executemany(
+                    f'INSERT OR REPLACE INTO "{self._table}" (key, value) VALUES (?, ?)',
+                    ((k, json.dumps(v, ensure_ascii=False)) for k, v in data.items()),
+                )
+            self._conn.execute('INSERT OR REPLACE INTO "meta" (key, value) VALUES (?, ?)', (mark, path))
+
+    def _fetch(self, key):
+        if key in self._cache:
+            return self._cache[key]
+        if self._complete:
+            return _MISSING
+        row = self._conn.execute(
+            f'SELECT value FROM "{self._table}" WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return _MISSING
+        value = self._cache[key] = json.loads(row[0])
+        return value
+
+    def _load_all(self):
+        if self._complete:
+            return
+        for key, raw in self._conn.execute(f'SELECT key, value FROM "{self._table}"'):
+            if key not in self._cache:
+                self._cache[key] = json.loads(raw)
+        self._complete = True
+
+    # ── Mapping API ───────────────────────────────────────────
+    def __getitem__(self, key):
+        value = self._fetch(key)
+        if value is _MISSING:
+            raise KeyError(key)
+        if isinstance(value, (dict, list)):
+            # вложенные значения cog-и меняют на месте (inv[item] -= 1)
+            self._dirty.add(key)
+        return value
+
+    def __contains__(self, key):
+        return self._fetch(key) is not _MISSING
+
+    def __setitem__(self, key, value):
+        old = self._fetch(key) if self.listeners else _MISSING
+        self._cache[key] = value
+        self._dirty.add(key)
+        self._deleted.discard(key)
+        for fn in self.listeners:
+            fn(key, old, value)
+
+    def __delitem__(self, key):
+        old = self._fetch(key)
+        if old is _MISSING:
+            raise KeyError(key)
+        self._cache[key] = _MISSING
+        self._dirty.discard(key)
+        self._deleted.add(key)
+        for fn in self.listeners:
+            fn(key, old, _MISSING)
+
+    def __iter__(self):
+        self._load_all()
+        return iter([k for k, v in self._cache.items() if v is not _MISSING])
+
+    def __len__(self):
+        self._load_all()
+        return sum(1 for v in self._cache.values() if v is not _MISSING)
+
+    # ── Persistence ───────────────────────────────────────────
+    def commit(self, on_error=None):
+        rows = [(k, snapshot(self._cache[k])) for k in self._dirty]
+        dels = [(k,) for k in self._deleted]
+        self._dirty.clear()
+        self._deleted.clear()
+        if not (rows or dels):
+            return
+
+        def failed(exc):
+            self._restore([k for k, _ in rows] + [k for k, in dels])
+            if on_error is not None:
+                on_error(exc)
+        submit(lambda: self._write_rows(rows, dels), on_error=failed)
+
+    def _restore(self, keys):
+        # Запись не удалась — ключи снова ждут commit(). Ключ, изменённый уже
+        # после неудачного commit(), и так в _dirty/_deleted; берётся текущее
+        # значение из кеша, а не то, что не записалось.
+        for key in keys:
+            if key in self._dirty or key in self._deleted:
+                continue
+            if self._cache.get(key, _MISSING) is _MISSING:
+                self._deleted.add(key)
+            else:
+                self._dirty.add(key)
+
+    def _write_rows(self, rows, dels):
+        conn    = _writer_conn(self._db_path)
+        encoded = [(k, json.dumps(v, ensure_ascii=False)) for k, v in rows]
+        with conn:
+            if dels:
+                conn.executemany(f'DELETE FROM "{self._table}" WHERE key = ?', dels)
+            if encoded:
+                conn.executemany(
+                    f'INSERT OR REPLACE INTO "{self._table}" (key, value) VALUES (?, ?)', encoded)
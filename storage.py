@@ -0,0 +1,168 @@
+"""
+storage.py — загрузка JSON и фоновая запись.
+save_json() только снимает снапшот данных и отдаёт его потоку-писателю:
+кодирование JSON и работа с файлом идут вне event loop. Поток один,
+поэтому порядок записей в каждый файл сохраняется. Об ошибке записи
+сообщает on_error(exc) — в потоке event loop, если он привязан bind_loop(),
+так что обработчик может спокойно вернуть данные в очередь на повтор.
+"""
+import atexit
+import json
+import os
+import queue
+import threading
+from collections.abc import Mapping, MutableMapping
+
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def snapshot(obj):
+    """Копия JSON-совместимых данных, которую можно безопасно отдать в другой поток."""
+    if isinstance(obj, _SCALARS):
+        return obj
+    if isinstance(obj, (dict, Mapping)):
+        return {k: v if isinstance(v, _SCALARS) else snapshot(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [v if isinstance(v, _SCALARS) else snapshot(v) for v in obj]
+    return obj
+
+
+def _write_json(path, data):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+class _Writer:
+    def __init__(self):
+        self._queue  = queue.Queue()
+        self._lock   = threading.Lock()
+        self._latest = {}      # path -> последний снапшот, ещё не записанный на диск
+        self._queued = set()   # path, для которых задача уже стоит в очереди
+        self._errors = {}      # path -> on_error последнего снапшота
+        self._thread = None
+        self.loop    = None    # event loop, в котором вызываются on_error
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="storage-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            job, on_error = self._queue.get()
+            try:
+                job()
+            except Exception as e:
+                print(f"[STORAGE] Ошибка записи: {e}")
+                if on_error is not None:
+                    self._report(on_error, e)
+            finally:
+                self._queue.task_done()
+
+    def _report(self, on_error, exc):
+        loop = self.loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(on_error, exc)
+                return
+            except RuntimeError:
+                pass   # loop закрывается — вызываем здесь же (atexit)
+        try:
+            on_error(exc)
+        except Exception as e:
+            print(f"[STORAGE] Ошибка в обработчике ошибки записи: {e}")
+
+    def submit(self, job, on_error=None):
+        self._ensure_thread()
+        self._queue.put((job, on_error))
+
+    def submit_json(self, path, data, on_error=None):
+        # Несколько снапшотов одного файла, ждущих в очереди, схлопываются в один
+        with self._lock:
+            self._latest[path] = data
+            self._errors[path] = on_error
+            if path in self._queued:
+                return
+            self._queued.add(path)
+        self.submit(lambda: self._write_latest(path), on_error=lambda e: self._latest_failed(path, e))
+
+    def _latest_failed(self, path, exc):
+        with self._lock:
+            on_error = self._errors.pop(path, None)
+        if on_error is not None:
+            on_error(exc)
+
+    def _write_latest(self, path):
+        with self._lock:
+            self._queued.discard(path)
+            data = self._latest[path]
+        _write_json(path, data)
+        with self._lock:
+            if self._latest.get(path) is data:
+                del self._latest[path]
+                self._errors.pop(path, None)
+
+    def latest(self, path):
+        with self._lock:
+            return self._latest.get(path)
+
+    def drain(self):
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+
+_writer = _Writer()
+submit  = _writer.submit
+drain   = _writer.drain
+atexit.register(drain)
+
+
+def bind_loop(loop):
+    """Вызывать on_error записей в этом event loop (call_soon_threadsafe)."""
+    _writer.loop = loop
+
+
+# ── JSON helpers ──────────────────────────────────────────────
+def load_json(path, default=None):
+    pending = _writer.latest(path)
+    if pending is not None:
+        return snapshot(pending)
+    if default is None:
+        default = {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return default if not isinstance(default, type) else default()
+
+
+def save_json(path, data, on_error=None):
+    _writer.submit_json(path, snapshot(data), on_error)
+
+
+class LazyJSON(MutableMapping):
+    """dict из JSON-файла, который читается только при первом обращении."""
+
+    def __init__(self, path: str):
+        self.path  = path
+        self._data = None
+
+    @property
+    def data(self) -> dict:
+        if self._data is None:
+            self._data = load_json(self.path)
+        return self._data
+
+    def ensure_loaded(self):
+        return self.data
+
+    def __getitem__(self, key):     return self.data[key]
+    def __setitem__(self, key, v):  self.data[key] = v
+    def __delitem__(self, key):     del self.data[key]
+    def __contains__(self, key):    return key in self.data
+    def __iter__(self):             return iter(list(self.data))
+    def __len__(self):              return len(self.data)
+    def get(self, key, default=None): return self.data.get(key, default)
+    def items(self):                return self.data.items()
@@ -0,0 +1,100 @@
+"""Компакция журнала денег: сбой записи снапшота не должен терять балансы."""
+import os
+
+import journal
+import storage
+from journal import Journal
+from players import PlayerStore
+
+
+def _open(funds_path, j):
+    store = PlayerStore()
+    funds = store.view("funds")
+    funds.load(storage.load_json(funds_path))
+    j.replay({"funds": funds})
+    return funds
+
+
+def _record(j, funds, uid, value):
+    old = funds.get(uid, 0)
+    funds[uid] = value
+    j.record("funds", uid, old, value)
+
+
+def test_compact_keeps_old_journal_when_snapshot_fails(tmp_path, monkeypatch):
+    funds_path = str(tmp_path / "player_funds.json")
+    j          = Journal(str(tmp_path / "money_journal.jsonl"))
+    funds      = PlayerStore().view("funds")
+    _record(j, funds, "1", 100)
+    _record(j, funds, "2", 250)
+    j.flush()
+
+    real_write = journal._write_json
+
+    def failing_write(path, data):
+        if path == funds_path:
+            raise OSError("диск заполнен")
+        real_write(path, data)
+
+    monkeypatch.setattr(journal, "_write_json", failing_write)
+    j.compact({funds_path: funds})
+    storage.drain()
+
+    assert os.path.exists(j.old_path)
+    assert not os.path.exists(funds_path)
+    # «перезапуск»: балансы восстанавливаются из .old
+    restored = _open(funds_path, Journal(j.path))
+    assert dict(restored.items()) == {"1": 100, "2": 250}
+
+    # следующая компакция не затирает .old, а после успешной записи удаляет его
+    _record(j, funds, "3", 7)
+    monkeypatch.setattr(journal, "_write_json", real_write)
+    j.compact({funds_path: funds})
+    storage.drain()
+
+    assert not os.path.exists(j.old_path)
+    restored = _open(funds_path, Journal(j.path))
+    assert dict(restored.items()) == {"1": 100, "2": 250, "3": 7}
+
+
+def test_failed_compaction_then_failed_again_keeps_all_records(tmp_path, monkeypatch):
+    funds_path = str(tmp_path / "player_funds.json")
+    j          = Journal(str(tmp_path / "money_journal.jsonl"))
+    funds      = PlayerStore().view("funds")
+
+    def failing_write(path, data):
+        raise OSError("нет прав")
+
+    monkeypatch.setattr(journal, "_write_json", failing_write)
+    _record(j, funds, "1", 10)
+    j.compact({funds_path: funds})
+    _record(j, funds, "2", 20)
+    j.compact({funds_path: funds})
+    storage.drain()
+
+    restored = _open(funds_path, Journal(j.path))
+    assert dict(restored.items()) == {"1": 10, "2": 20}
+
+
+def test_failed_append_keeps_batch_for_next_flush(tmp_path, monkeypatch):
+    funds_path = str(tmp_path / "player_funds.json")
+    j          = Journal(str(tmp_path / "money_journal.jsonl"))
+    funds      = PlayerStore().view("funds")
+    real_append = j._append
+
+    def failing_append(batch):
+        raise OSError("диск заполнен")
+
+    errors = []
+    monkeypatch.setattr(j, "_append", failing_append)
+    _record(j, funds, "1", 100)
+    j.flush(on_error=errors.append)
+    storage.drain()
+    assert len(errors) == 1
+
+    monkeypatch.setattr(j, "_append", real_append)
+    _record(j, funds, "2", 40)
+    j.flush()
+    storage.drain()
+    restored = _open(funds_path, Journal(j.path))
+    assert dict(restored.items()) == {"1": 100, "2": 40}
@@ -0,0 +1,65 @@
+"""SQLiteCollection: одноразовая миграция из JSON."""
+import json
+import sqlite3
+
+import storage
+from sqlite_store import SQLiteCollection, connect
+
+
+def _reopen(db_path, json_path):
+    return SQLiteCollection(connect(db_path), "player_loans", json_path)
+
+
+def test_json_imported_once(tmp_path):
+    db_path, json_path = str(tmp_path / "bot.db"), tmp_path / "player_loans.json"
+    json_path.write_text(json.dumps({"1": {"amount": 500}, "2": {"amount": 900}}), encoding="utf-8")
+
+    loans = _reopen(db_path, str(json_path))
+    assert dict(loans.items()) == {"1": {"amount": 500}, "2": {"amount": 900}}
+
+
+def test_deleted_rows_stay_deleted_after_reopen(tmp_path):
+    db_path, json_path = str(tmp_path / "bot.db"), tmp_path / "player_loans.json"
+    json_path.write_text(json.dumps({"1": {"amount": 500}}), encoding="utf-8")
+
+    loans = _reopen(db_path, str(json_path))
+    del loans["1"]                      # кредит погашен, таблица пуста
+    loans.commit()
+    storage.drain()
+
+    assert len(_reopen(db_path, str(json_path))) == 0
+
+
+def test_json_appearing_later_is_not_imported(tmp_path):
+    db_path, json_path = str(tmp_path / "bot.db"), tmp_path / "player_loans.json"
+    assert len(_reopen(db_path, str(json_path))) == 0
+
+    json_path.write_text(json.dumps({"1": {"amount": 500}}), encoding="utf-8")
+    assert len(_reopen(db_path, str(json_path))) == 0
+
+
+def test_failed_commit_keeps_rows_pending(tmp_path, monkeypatch):
+    db_path, json_path = str(tmp_path / "bot.db"), str(tmp_path / "player_loans.json")
+    loans = _reopen(db_path, json_path)
+    loans["1"] = {"amount": 500}
+    loans["2"] = {"amount": 900}
+    loans.commit()
+    storage.drain()
+
+    real_write = loans._write_rows
+
+    def failing_write(rows, dels):
+        raise sqlite3.OperationalError("database is locked")
+
+    errors = []
+    monkeypatch.setattr(loans, "_write_rows", failing_write)
+    loans["1"] = {"amount": 100}
+    del loans["2"]
+    loans.commit(on_error=errors.append)
+    storage.drain()
+    assert len(errors) == 1
+
+    monkeypatch.setattr(loans, "_write_rows", real_write)
+    loans.commit()
+    storage.drain()
+    assert dict(_reopen(db_path, json_path).items()) == {"1": {"amount": 100}}
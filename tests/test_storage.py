@@ -0,0 +1,47 @@
+"""storage: ошибка записи в потоке возвращается вызывающему через on_error."""
+import asyncio
+import os
+
+import storage
+
+
+def test_failed_json_write_reports_error_in_loop(tmp_path):
+    path = str(tmp_path / "missing_dir" / "data.json")   # каталога нет — запись упадёт
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        storage.bind_loop(loop)
+        got = loop.create_future()
+        storage.save_json(path, {"1": 5}, on_error=got.set_result)
+        return await asyncio.wait_for(got, 5)
+
+    try:
+        exc = asyncio.run(main())
+    finally:
+        storage.bind_loop(None)
+    assert isinstance(exc, OSError)
+    assert not os.path.exists(path)
+
+
+def test_failed_write_without_loop_calls_handler_directly(tmp_path):
+    errors = []
+    storage.save_json(str(tmp_path / "nope" / "x.json"), {}, on_error=errors.append)
+    storage.drain()
+    assert len(errors) == 1
+
+
+def test_data_marks_collection_dirty_again(tmp_path, monkeypatch):
+    import data
+    monkeypatch.setattr(data, "SAVE_INTERVAL", 5)
+    before = data.COMMAND_METRICS.write_errors
+    data._dirty.discard(data.WARNS_FILE)
+    monkeypatch.setitem(data._COLLECTIONS, data.WARNS_FILE, {"1": []})
+    monkeypatch.setattr(data, "save_json",
+                        lambda path, coll, on_error=None: storage.save_json(
+                            str(tmp_path / "nope" / path), coll, on_error=on_error))
+    data.mark_dirty(data.WARNS_FILE)
+    data.flush_dirty()
+    storage.drain()
+    assert data.WARNS_FILE in data._dirty
+    assert data.COMMAND_METRICS.write_errors == before + 1
+    data._dirty.discard(data.WARNS_FILE)
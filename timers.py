@@ -0,0 +1,118 @@
+"""
+timers.py — общий планировщик таймеров с обратным отсчётом в сообщениях.
+Раньше каждый пикер с «ошибкой телефона» держал свою корутину со
+sleep(15) и правкой сообщения на каждом шаге. TimerWheel — одна задача,
+которая раз в tick сдвигает колесо таймеров: истёкшие таймеры вызывают
+on_expire, у видимых пересчитывается текст, и правится только то, что
+изменилось. Правок за tick не больше max_edits, поэтому нагрузка на API
+растёт с частотой тиков, а не с числом работников.
+"""
+import asyncio
+import time
+
+
+class _Timer:
+    __slots__ = ("key", "deadline", "on_expire", "render", "message", "view", "shown")
+
+    def __init__(self, key, deadline, on_expire, render, message, view):
+        self.key       = key
+        self.deadline  = deadline
+        self.on_expire = on_expire
+        self.render    = render    # remaining_seconds -> текст сообщения
+        self.message   = message
+        self.view      = view
+        self.shown     = None      # последний текст, отправленный в сообщение
+
+
+class TimerWheel:
+    def __init__(self, tick: float = 1.0, slots: int = 512, max_edits: int = 10):
+        self.tick      = tick
+        self.max_edits = max_edits
+        self._wheel    = [set() for _ in range(slots)]   # слот -> ключи таймеров
+        self._timers   = {}                              # ключ -> _Timer
+        self._visible  = {}                              # ключ -> _Timer с render
+        self._dirty    = {}                              # ключ -> текст, ждущий правки (по порядку)
+        self._task     = None
+        self.stats     = {"scheduled": 0, "expired": 0, "edits": 0, "skipped": 0}
+
+    def _slot(self, deadline: float) -> set:
+        # слот первого тика после срока — к его обработке таймер точно истёк
+        return self._wheel[(int(deadline / self.tick) + 1) % len(self._wheel)]
+
+    def schedule(self, key, delay: float, on_expire, *, render=None, message=None, view=None):
+        """
+        Через delay секунд вызвать on_expire() (корутина). Если задан render,
+        сообщение message показывает render(осталось_секунд) с view, пока таймер идёт.
+        Таймер с тем же ключом заменяется.
+        """
+        self.cancel(key)
+        timer = _Timer(key, time.monotonic() + delay, on_expire, render, message, view)
+        self._timers[key] = timer
+        self._slot(timer.deadline).add(key)
+        if render is not None and message is not None:
+            self._visible[key] = timer
+            self._refresh(timer, delay)
+        self.stats["scheduled"] += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def cancel(self, key):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            self._slot(timer.deadline).discard(key)
+            self._visible.pop(key, None)
+            self._dirty.pop(key, None)
+
+    def __len__(self):
+        return len(self._timers)
+
+    def _refresh(self, timer, remaining):
+        text = timer.render(max(0.0, remaining))
+        if text == timer.shown:
+            self.stats["skipped"] += 1
+            return
+        timer.shown = text
+        self._dirty.pop(timer.key, None)   # в конец очереди правок
+        self._dirty[timer.key] = text
+
+    # ── Тик ───────────────────────────────────────────────────
+    async def _run(self):
+        last = int(time.monotonic() / self.tick)
+        while self._timers or self._dirty:
+            await asyncio.sleep(self.tick)
+            now     = time.monotonic()
+            current = int(now / self.tick)
+            # слоты всех тиков с прошлого прохода (loop мог отстать)
+            for t in range(last + 1, current + 1):
+                for key in list(self._wheel[t % len(self._wheel)]):
+                    timer = self._timers.get(key)
+                    if timer is not None and timer.deadline <= now:
+                        self.cancel(key)
+                        self.stats["expired"] += 1
+                        asyncio.get_running_loop().create_task(self._expire(timer))
+            last = current
+            for timer in list(self._visible.values()):
+                self._refresh(timer, timer.deadline - now)
+            if self._dirty:
+                batch = []
+                for key in list(self._dirty)[:self.max_edits]:
+                    text  = self._dirty.pop(key)
+                    timer = self._timers.get(key)
+                    if timer is not None:
+                        batch.append(self._edit(timer, text))
+                if batch:
+                    asyncio.get_running_loop().create_task(self._flush(batch))
+
+    async def _flush(self, batch):
+        await asyncio.gather(*batch, return_exceptions=True)
+
+    async def _edit(self, timer, text):
+        self.stats["edits"] += 1
+        await timer.message.edit(content=text, view=timer.view)
+
+    @staticmethod
+    async def _expire(timer):
+        try:
+            await timer.on_expire()
+        except Exception as e:
+            print(f"[TIMERS] Ошибка в таймере {timer.key}: {e}")
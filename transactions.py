@@ -0,0 +1,82 @@
+"""
+transactions.py — атомарные денежные операции между игроками.
+pay, rob, deposit, withdraw, блэкджек и погашение кредита читали баланс,
+ждали (await) и потом записывали — два одновременных вызова могли
+потратить одни и те же деньги дважды. Ledger.transaction(uid, ...) берёт
+asyncio-замки участников в порядке id (без взаимных блокировок), копит
+изменения как дельты и применяет их разом при выходе из блока.
+Каждая затронутая коллекция сохраняется один раз за транзакцию.
+Дельты прибавляются к значению на момент применения, поэтому прямые
+записи вне транзакций (flip, crime и т.п.) не теряются.
+"""
+import weakref
+from asyncio import Lock
+from contextlib import asynccontextmanager
+
+
+class Transaction:
+    def __init__(self, ledger: "Ledger", uids):
+        self._ledger = ledger
+        self.uids    = uids
+        self._deltas = {}   # (коллекция, uid) -> дельта
+
+    def _check(self, uid):
+        if uid not in self.uids:
+            raise ValueError(f"{uid} не участвует в транзакции")
+
+    def get(self, coll: str, uid) -> int:
+        """Баланс с учётом ещё не применённых изменений этой транзакции."""
+        self._check(uid)
+        return self._ledger.collections[coll].get(uid, 0) + self._deltas.get((coll, uid), 0)
+
+    def add(self, coll: str, uid, delta: int):
+        self._check(uid)
+        self._deltas[(coll, uid)] = self._deltas.get((coll, uid), 0) + delta
+
+    def move(self, src, dst, amount: int):
+        """Перевод amount из (коллекция, uid) src в (коллекция, uid) dst."""
+        self.add(*src, -amount)
+        self.add(*dst, amount)
+
+    def _apply(self):
+        touched = set()
+        for (coll, uid), delta in self._deltas.items():
+            if delta:
+                mapping      = self._ledger.collections[coll]
+                mapping[uid] = mapping.get(uid, 0) + delta
+                touched.add(coll)
+        for coll in touched:
+            self._ledger.savers[coll]()
+
+
+class Ledger:
+    def __init__(self, collections: dict, savers: dict):
+        self.collections = collections   # имя -> dict-подобная коллекция балансов
+        self.savers      = savers        # имя -> save_*()
+        self._locks      = weakref.WeakValueDictionary()   # uid -> Lock, пока он кому-то нужен
+
+    def lock(self, uid) -> Lock:
+        lock = self._locks.get(uid)
+        if lock is None:
+            lock = self._locks[uid] = Lock()
+        return lock
+
+    @asynccontextmanager
+    async def transaction(self, *uids):
+        """
+        async with LEDGER.transaction(a, b) as tx: ... — изменения применяются
+        только при нормальном выходе; исключение внутри блока их отбрасывает.
+        """
+        uids  = sorted(set(uids), key=int)
+        locks = [self.lock(uid) for uid in uids]
+        held  = []
+        try:
+            for lock in locks:
+                await lock.acquire()
+                held.append(lock)
+            tx = Transaction(self, frozenset(uids))
+            yield tx
+            tx._apply()
+        finally:
+            for lock in reversed(held):
+                lock.release()